@@ -3,8 +3,9 @@ Portfolio Controller - Handles all portfolio business logic
 Extracted from MainWindow to follow Single Responsibility Principle
 """
 
-import threading
+import operator
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Callable
 from dataclasses import dataclass
@@ -19,6 +20,17 @@ from services.calculator import PortfolioCalculator
 from utils.helpers import FormatHelper
 
 
+# Sort key per sort field offered in the UI
+SORT_KEYS: Dict[str, Callable[[Stock], Any]] = {
+    "symbol": lambda stock: stock.symbol.lower(),
+    "company": lambda stock: (stock.company_name or "").lower(),
+    "profit_loss": operator.attrgetter("profit_loss_amount"),
+    "profit_loss_pct": operator.attrgetter("profit_loss_percentage"),
+    "current_value": operator.attrgetter("current_value"),
+    "days_held": operator.attrgetter("days_held"),
+}
+
+
 @dataclass
 class PortfolioState:
     """Centralized portfolio state management"""
@@ -43,6 +55,16 @@ class PortfolioController:
         self.calculator = PortfolioCalculator()
         self.state = PortfolioState()
         
+        # Sort results per (field, ascending), valid until the stocks or prices change
+        self._sorted_by: Dict[tuple, tuple] = {}
+        self._sort_version = 0
+        
+        # Upper-cased symbol -> Stock, rebuilt whenever the portfolio is loaded
+        self._by_symbol: Dict[str, Stock] = {}
+        
+        # One long-lived worker for price refreshes instead of a thread per call
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PriceRefresh")
+        
         # Callbacks for UI updates
         self.on_portfolio_updated: Optional[Callable] = None
         self.on_status_updated: Optional[Callable[[str], None]] = None
@@ -64,6 +86,12 @@ class PortfolioController:
             
             stock_data = self.db_manager.get_all_stocks()
             self.state.stocks = [Stock(**data) for data in stock_data]
+            by_symbol = {}
+            for stock in self.state.stocks:
+                self._search_text(stock)
+                by_symbol.setdefault(stock.symbol.upper(), stock)
+            self._by_symbol = by_symbol
+            self._invalidate_sort_cache()
             
             # Calculate summary
             self.state.portfolio_summary = self.calculator.calculate_portfolio_summary(self.state.stocks)
@@ -134,27 +162,23 @@ class PortfolioController:
             self._handle_error(f"Failed to delete stock: {str(e)}")
             return False
     
-    def refresh_prices_async(self, callback: Callable = None) -> None:
+    def refresh_prices_async(self, callback: Callable = None) -> Optional[Future]:
         """Refresh stock prices asynchronously"""
         if self.state.is_updating:
             self._update_status("Price update already in progress...")
-            return
+            return None
             
         if not self.state.stocks:
             self._update_status("No stocks to update")
-            return
+            return None
             
         if not self.price_service:
             self._handle_error("Price service not available")
-            return
+            return None
         
-        # Start async refresh
-        thread = threading.Thread(
-            target=self._refresh_prices_background,
-            args=(callback,),
-            daemon=True
-        )
-        thread.start()
+        # Start async refresh; mark busy now so a second click is not queued behind it
+        self.state.is_updating = True
+        return self._executor.submit(self._refresh_prices_background, callback)
     
     def _refresh_prices_background(self, callback: Callable = None):
         """Background price refresh operation"""
@@ -190,6 +214,8 @@ class PortfolioController:
                         self.db_manager.update_price_cache(stock.symbol, new_price)
                         updated_count += 1
             
+            self._invalidate_sort_cache()
+            
             # Recalculate portfolio summary
             self.state.portfolio_summary = self.calculator.calculate_portfolio_summary(self.state.stocks)
             self.state.last_update_time = datetime.now()
@@ -218,35 +244,55 @@ class PortfolioController:
                                   sort_field: str = "symbol", 
                                   ascending: bool = True) -> List[Stock]:
         """Get filtered and sorted stock list"""
-        filtered_stocks = self.state.stocks
+        # Start from the cached sort order; filtering preserves it
+        filtered_stocks = self._sorted_stocks(sort_field, ascending)
         
         # Apply search filter
         if search_term:
             search_lower = search_term.lower().strip()
-            filtered_stocks = []
-            for stock in self.state.stocks:
-                if (search_lower in stock.symbol.lower() or 
-                    search_lower in (stock.company_name or "").lower()):
-                    filtered_stocks.append(stock)
+            search_text = self._search_text
+            filtered_stocks = [stock for stock in filtered_stocks
+                               if search_lower in search_text(stock)]
+        else:
+            filtered_stocks = list(filtered_stocks)
         
-        # Apply sorting
+        return filtered_stocks
+    
+    def _sorted_stocks(self, sort_field: str, ascending: bool = True) -> List[Stock]:
+        """Stocks in sort_field order, reused until the portfolio changes"""
+        version = self._sort_version
+        cache_key = (sort_field, ascending)
+        cached = self._sorted_by.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        key = SORT_KEYS.get(sort_field)
+        if key is None:
+            return self.state.stocks
         try:
-            if sort_field == "symbol":
-                filtered_stocks.sort(key=lambda x: x.symbol.lower(), reverse=not ascending)
-            elif sort_field == "company":
-                filtered_stocks.sort(key=lambda x: (x.company_name or "").lower(), reverse=not ascending)
-            elif sort_field == "profit_loss":
-                filtered_stocks.sort(key=lambda x: x.profit_loss_amount, reverse=not ascending)
-            elif sort_field == "profit_loss_pct":
-                filtered_stocks.sort(key=lambda x: x.profit_loss_percentage, reverse=not ascending)
-            elif sort_field == "current_value":
-                filtered_stocks.sort(key=lambda x: x.current_value, reverse=not ascending)
-            elif sort_field == "days_held":
-                filtered_stocks.sort(key=lambda x: x.days_held, reverse=not ascending)
+            # sorted() keeps equal keys in portfolio order in both directions
+            ordered = sorted(self.state.stocks, key=key, reverse=not ascending)
         except Exception as e:
             print(f"Warning: Could not sort by {sort_field}: {e}")
+            return self.state.stocks
         
-        return filtered_stocks
+        self._sorted_by[cache_key] = (version, ordered)
+        return ordered
+    
+    def _invalidate_sort_cache(self):
+        """Drop cached sort orders after stocks or prices change"""
+        self._sort_version += 1
+        self._sorted_by = {}
+    
+    @staticmethod
+    def _search_text(stock: Stock) -> str:
+        """Lower-cased symbol and company name, computed once per Stock"""
+        text = getattr(stock, '_search_blob', None)
+        if text is None:
+            # Newline separator keeps a query from matching across the two fields
+            text = f"{stock.symbol}\n{stock.company_name or ''}".lower()
+            stock._search_blob = text
+        return text
     
     def get_portfolio_summary(self) -> Optional[PortfolioSummary]:
         """Get current portfolio summary"""
@@ -258,10 +304,7 @@ class PortfolioController:
     
     def find_stock_by_symbol(self, symbol: str) -> Optional[Stock]:
         """Find stock by symbol"""
-        for stock in self.state.stocks:
-            if stock.symbol.upper() == symbol.upper():
-                return stock
-        return None
+        return self._by_symbol.get(symbol.upper())
     
     def is_updating(self) -> bool:
         """Check if portfolio is currently updating"""
@@ -292,6 +335,10 @@ class PortfolioController:
             })
         return export_data
     
+    def shutdown(self):
+        """Stop the background worker; a refresh still running is abandoned"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
     def _update_status(self, message: str):
         """Update status message"""
         if self.on_status_updated:
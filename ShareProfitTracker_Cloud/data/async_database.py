@@ -6,7 +6,7 @@ Fixes UI freezing issues from synchronous database calls
 import asyncio
 import sqlite3
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Optional, Dict, Any
@@ -259,6 +259,10 @@ class AsyncDatabaseManager:
             self.executor, self._update_price_cache_sync, symbol, price
         )
     
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Run a callable on the database thread pool and return its Future"""
+        return self.executor.submit(fn, *args, **kwargs)
+    
     # Synchronous methods that run in thread pool
     def _get_all_stocks_sync(self) -> List[Dict[str, Any]]:
         """Get all stocks (runs in thread pool)"""
@@ -159,8 +159,9 @@ class CashManagementDialog:
             self.balance_var.set(f"Current Cash Balance: {FormatHelper.format_currency(current_balance)}")
             
             # Clear tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
             
             # Load transactions
             transactions = self.db_manager.get_all_cash_transactions()
@@ -39,10 +39,7 @@ class CloudLoginDialog:
 
         # Center
         self.dialog.transient(self.parent)
-        self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() // 2) - (400 // 2)
-        y = (self.dialog.winfo_screenheight() // 2) - (450 // 2)
-        self.dialog.geometry(f"400x450+{x}+{y}")
+        ModernUI.center_dialog(self.dialog, 400, 450)
 
         # Main frame
         main_frame = ttk.Frame(self.dialog, padding="20")
@@ -235,10 +232,7 @@ class CloudSyncDialog:
 
         # Center
         self.dialog.transient(self.parent)
-        self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() // 2) - (450 // 2)
-        y = (self.dialog.winfo_screenheight() // 2) - (400 // 2)
-        self.dialog.geometry(f"450x400+{x}+{y}")
+        ModernUI.center_dialog(self.dialog, 450, 400)
 
         # Main frame
         main_frame = ttk.Frame(self.dialog, padding="20")
@@ -314,8 +314,9 @@ class DividendDialog:
     def load_dividend_data(self):
         try:
             # Clear tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
             
             # Load dividends
             dividends = self.db_manager.get_all_dividends()
@@ -229,8 +229,9 @@ class ExpensesDialog:
                 month = current_date.month
             
             # Clear tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
             
             # Load expenses for selected month
             expenses = self.db_manager.get_expenses_by_month(year, month)
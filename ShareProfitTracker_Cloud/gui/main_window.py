@@ -57,6 +57,7 @@ class MainWindow:
         self.theme_manager = ThemeManager()
         
         self.stocks: List[Stock] = []
+        self._stock_by_symbol = {}
         self.portfolio_summary: Optional[PortfolioSummary] = None
         self.last_update_time: Optional[datetime] = None
         self.is_updating = False
@@ -187,13 +188,9 @@ class MainWindow:
     
     def update_dashboard(self):
         """Update dashboard metrics"""
-        # Clear existing metric cards
-        for card in self.metric_cards.values():
-            card.destroy()
-        self.metric_cards.clear()
-        
-        # Calculate metrics
-        metrics = MetricCalculator.calculate_portfolio_metrics(self.stocks)
+        # One summary pass feeds both the dashboard and portfolio_summary
+        self.portfolio_summary = self.calculator.calculate_portfolio_summary(self.stocks)
+        metrics = MetricCalculator.metrics_from_summary(self.portfolio_summary)
         
         # Create metric cards
         cards_data = [
@@ -205,9 +202,15 @@ class MainWindow:
             ("Total Stocks", str(metrics['total_stocks']), None, None)
         ]
         
+        # Cards are built once; later refreshes only change their label text
+        if self.metric_cards:
+            for title, value, change, change_type in cards_data:
+                self.metric_cards[title].update(value, change, change_type)
+            return
+        
         for i, (title, value, change, change_type) in enumerate(cards_data):
             card = ModernUI.create_metric_card(self.metrics_frame, title, value, change, change_type)
-            card.grid(row=0, column=i, padx=(0, 15) if i < len(cards_data)-1 else 0, sticky="ew")
+            card.frame.grid(row=0, column=i, padx=(0, 15) if i < len(cards_data)-1 else 0, sticky="ew")
             self.metric_cards[title] = card
         
         # Configure column weights for equal distribution
@@ -461,7 +464,7 @@ class MainWindow:
                 
                 def apply_results():
                     try:
-                        self.stocks = [Stock(**data) for data in stock_data]
+                        self._set_stocks([Stock(**data) for data in stock_data])
                         # Portfolio data loaded from database successfully
                         # Stock objects created and ready for display
                         self.update_portfolio_display()
@@ -559,8 +562,6 @@ class MainWindow:
             self.notifications_panel.update_stocks(self.stocks)
     
     def update_summary_display(self):
-        self.portfolio_summary = self.calculator.calculate_portfolio_summary(self.stocks)
-        
         # Portfolio summary is now only shown in the dashboard
         # No duplicate summary labels needed
         
@@ -971,8 +972,16 @@ class MainWindow:
                 # Add to database
                 stock_id = self.db_manager.add_stock(**stock_data)
                 
-                # Immediately reload and refresh
-                self._force_refresh()
+                # Build the new row locally instead of reloading every stock
+                stock = Stock(id=stock_id, **stock_data)
+                stock.symbol = stock.symbol.upper()
+                cached = self.db_manager.get_cached_price(stock.symbol)
+                if cached:
+                    stock.current_price = cached['current_price']
+                    stock.last_updated = cached['last_updated']
+                self.stocks.append(stock)
+                self._stock_by_symbol.setdefault(stock.symbol, stock)
+                self._apply_local_change()
                 
                 messagebox.showinfo("Success", f"Added {stock_data['symbol']} to portfolio")
                 
@@ -982,16 +991,31 @@ class MainWindow:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add stock: {str(e)}")
     
+    def _set_stocks(self, stocks: List[Stock]):
+        """Replace the stock list and rebuild the symbol index"""
+        self.stocks = stocks
+        self._stock_by_symbol = {}
+        for stock in stocks:
+            # First lot wins when the same symbol is held more than once
+            self._stock_by_symbol.setdefault(stock.symbol, stock)
+    
+    def _apply_local_change(self):
+        """Redraw after an in-memory add/edit/delete without a database reload"""
+        self.update_portfolio_display()
+        self.update_summary_display()
+        self.status_var.set(f"Portfolio updated - {len(self.stocks)} stocks")
+    
     def _force_refresh(self):
         """Force a complete refresh of the portfolio display"""
         try:
             # Clear the tree completely
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
             
             # Reload from database
             stock_data = self.db_manager.get_all_stocks()
-            self.stocks = [Stock(**data) for data in stock_data]
+            self._set_stocks([Stock(**data) for data in stock_data])
             
             # Rebuild the tree
             for stock in self.stocks:
@@ -1035,7 +1059,7 @@ class MainWindow:
             symbol = item_values[0]
             
             # Find the stock object
-            stock = next((s for s in self.stocks if s.symbol == symbol), None)
+            stock = self._stock_by_symbol.get(symbol)
             if not stock:
                 messagebox.showerror("Error", f"Could not find stock data for {symbol}")
                 return
@@ -1060,8 +1084,22 @@ class MainWindow:
                     broker=result_data.get('broker', '')
                 )
                 
-                # Force refresh
-                self._force_refresh()
+                # Mutate the existing Stock in place instead of reloading
+                new_symbol = result_data['symbol'].upper()
+                if new_symbol != stock.symbol:
+                    # The old price belongs to the old symbol
+                    cached = self.db_manager.get_cached_price(new_symbol)
+                    stock.current_price = cached['current_price'] if cached else None
+                    stock.last_updated = cached['last_updated'] if cached else None
+                stock.symbol = new_symbol
+                stock.company_name = result_data.get('company_name', '')
+                stock.quantity = result_data['quantity']
+                stock.purchase_price = result_data['purchase_price']
+                stock.purchase_date = result_data['purchase_date']
+                stock.broker = result_data.get('broker', '')
+                stock.cash_invested = stock.quantity * stock.purchase_price
+                self._set_stocks(self.stocks)
+                self._apply_local_change()
                 
                 messagebox.showinfo("Success", f"Updated {symbol}")
             
@@ -1082,12 +1120,13 @@ class MainWindow:
             # Confirm deletion
             if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {symbol} from your portfolio?"):
                 # Find the stock object
-                stock = next((s for s in self.stocks if s.symbol == symbol), None)
+                stock = self._stock_by_symbol.get(symbol)
                 if stock and stock.id:
                     self.db_manager.delete_stock(stock.id)
                     
-                    # Force refresh
-                    self._force_refresh()
+                    # Drop the row locally instead of reloading
+                    self._set_stocks([s for s in self.stocks if s is not stock])
+                    self._apply_local_change()
                     
                     messagebox.showinfo("Success", f"Deleted {symbol} from portfolio")
                     
@@ -1315,7 +1354,7 @@ class MainWindow:
             return
 
         try:
-            AIAdvisorDialog(self.root, self.ai_advisor, self.stocks)
+            AIAdvisorDialog.open(self.root, self.ai_advisor, self.stocks)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open AI Advisor: {str(e)}")
 
@@ -1327,7 +1366,7 @@ class MainWindow:
             return
 
         try:
-            PriceAlertsDialog(self.root, self.price_alerts, self.stocks)
+            PriceAlertsDialog.open(self.root, self.price_alerts, self.stocks)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open Price Alerts: {str(e)}")
 
@@ -1339,7 +1378,7 @@ class MainWindow:
             return
 
         try:
-            RebalancingDialog(self.root, self.rebalancer, self.stocks)
+            RebalancingDialog.open(self.root, self.rebalancer, self.stocks)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open Rebalancing: {str(e)}")
 
@@ -1351,7 +1390,7 @@ class MainWindow:
             return
 
         try:
-            TaxOptimizationDialog(self.root, self.tax_optimizer, self.stocks)
+            TaxOptimizationDialog.open(self.root, self.tax_optimizer, self.stocks)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open Tax Optimization: {str(e)}")
 
@@ -1363,7 +1402,7 @@ class MainWindow:
             return
 
         try:
-            if self.cloud_service.is_authenticated():
+            if self.cloud_service.is_logged_in():
                 # Already logged in - show sync dialog
                 def on_sync_complete():
                     # Reload portfolio after sync
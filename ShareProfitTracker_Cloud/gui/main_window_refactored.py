@@ -5,6 +5,7 @@ Reduced from 1000+ lines to ~300 lines by extracting business logic
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 import sys
@@ -20,16 +21,12 @@ from utils.config import AppConfig
 from utils.helpers import FormatHelper, FileHelper
 from utils.theme_manager import ThemeManager
 
+# Dialogs and the notifications panel are imported where they are first used;
+# their modules pull in the stock database and fetcher services
 try:
-    from gui.add_stock_dialog import AddStockDialog
     from gui.modern_ui import ModernUI, MetricCalculator
-    from gui.notifications_panel import NotificationsPanel
-    from gui.settings_dialog import SettingsDialog
 except ImportError:
-    from .add_stock_dialog import AddStockDialog
     from .modern_ui import ModernUI, MetricCalculator
-    from .notifications_panel import NotificationsPanel
-    from .settings_dialog import SettingsDialog
 
 
 class MainWindowRefactored:
@@ -70,11 +67,24 @@ class MainWindowRefactored:
         self.user_var = tk.StringVar()
         self.status_var = tk.StringVar()
         self.cash_balance_var = tk.StringVar()
+        self._search_after_id = None
+        self._pending_status = None
+        self._status_after = None  # after_idle id while a status write is queued
+        self._filter_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PortfolioFilter")
+        self._pending_filter = None
+        self._filter_token = 0  # bumped per request; stale filter results are dropped
+        self._cash_balance_dirty = True
+        self._last_cash = None  # balance currently shown in the status bar
+        self._active_user_id = None
         
         # UI components  
         self.tree = None
+        self._row_cache = {}  # iid -> (values, tags) last written to the tree
+        self._formatted_cache = {}  # iid -> (signature, values, tags)
         self.notifications_panel = None
+        self._last_notif_key = None  # holdings last sent to the notifications panel
         self.metric_cards = {}
+        self._snapshot = {'stocks': [], 'metrics': None}  # shared by every view per update
         
         # Initialize UI
         self.setup_window()
@@ -145,21 +155,37 @@ class MainWindowRefactored:
         user_label = tk.Label(center_frame, text="User:", font=("Arial", 9, "bold"))
         user_label.pack(side=tk.LEFT, padx=(0, 5))
         
-        # Get users and populate dropdown
-        users = self.db_manager.get_all_users()
-        active_user = self.db_manager.get_active_user()
+        # Render the dropdown empty; users are loaded off the UI thread
+        self.user_mapping = {}
+        self.user_combobox = ttk.Combobox(center_frame, textvariable=self.user_var,
+                                         values=[], state="readonly", width=15)
+        self.user_combobox.pack(side=tk.LEFT)
+        self.user_combobox.bind("<<ComboboxSelected>>", self.on_user_changed)
         
+        future = self.db_manager.submit(
+            lambda: (self.db_manager.get_all_users(), self.db_manager.get_active_user())
+        )
+        future.add_done_callback(self._on_users_loaded)
+    
+    def _on_users_loaded(self, future):
+        """Hand the background user query back to the Tk thread"""
+        try:
+            users, active_user = future.result()
+        except Exception as e:
+            self.root.after(0, self.on_status_updated, f"Failed to load users: {e}")
+            return
+        self.root.after(0, self._populate_users, users, active_user)
+    
+    def _populate_users(self, users, active_user):
+        """Fill the user dropdown once the user list is available"""
         user_values = [user['display_name'] for user in users]
+        self.user_combobox.configure(values=user_values)
         if active_user:
             self.user_var.set(active_user['display_name'])
+            self._active_user_id = active_user['id']
         elif user_values:
             self.user_var.set(user_values[0])
         
-        self.user_combobox = ttk.Combobox(center_frame, textvariable=self.user_var,
-                                         values=user_values, state="readonly", width=15)
-        self.user_combobox.pack(side=tk.LEFT)
-        self.user_combobox.bind("<<ComboboxSelected>>", self.on_user_changed)
-        
         self.user_mapping = {user['display_name']: user['id'] for user in users}
     
     def create_dashboard(self):
@@ -197,6 +223,8 @@ class MainWindowRefactored:
         self.notifications_frame.grid_rowconfigure(0, weight=1)
         self.notifications_frame.grid_columnconfigure(0, weight=1)
         
+        from gui.notifications_panel import NotificationsPanel
+        
         # Initialize with empty list, will be updated when portfolio loads
         self.notifications_panel = NotificationsPanel(self.notifications_frame, [])
     
@@ -274,6 +302,10 @@ class MainWindowRefactored:
         v_scrollbar.grid(row=0, column=1, sticky="ns")
         h_scrollbar.grid(row=1, column=0, sticky="ew")
         
+        # Configure tag colors once; apply_theme overrides them per theme
+        self.tree.tag_configure("profit", foreground=AppConfig.COLORS['profit'])
+        self.tree.tag_configure("loss", foreground=AppConfig.COLORS['loss'])
+        
         # Bind double-click
         self.tree.bind("<Double-1>", self.on_stock_double_click)
     
@@ -319,17 +351,48 @@ class MainWindowRefactored:
     # Controller callback methods
     def on_portfolio_updated(self):
         """Called when portfolio data is updated"""
+        self.refresh_snapshot()
         self.update_portfolio_display()
         self.update_dashboard()
         
         # Update notifications panel
         if self.notifications_panel:
-            stocks = self.portfolio_controller.get_stocks()
-            self.notifications_panel.update_stocks(stocks)
+            self.update_notifications(self._snapshot['stocks'])
+    
+    def update_notifications(self, stocks: List[Stock]):
+        """Pass holdings to the notifications panel only when the fields it shows changed"""
+        key = tuple((s.symbol, s.company_name, s.current_price, s.quantity) for s in stocks)
+        if key == self._last_notif_key:
+            return
+        self._last_notif_key = key
+        self.notifications_panel.update_stocks(stocks)
+    
+    def refresh_snapshot(self):
+        """Compute the portfolio metrics once for all views of this update"""
+        stocks = self.portfolio_controller.get_stocks()
+        # The controller totals the portfolio whenever it loads or reprices
+        summary = self.portfolio_controller.get_portfolio_summary()
+        if summary is not None:
+            metrics = MetricCalculator.metrics_from_summary(summary)
+        else:
+            metrics = MetricCalculator.calculate_portfolio_metrics(stocks)
+        self._snapshot = {
+            'stocks': stocks,
+            'metrics': metrics
+        }
     
     def on_status_updated(self, message: str):
-        """Called when status message changes"""
-        self.status_var.set(message)
+        """Called when status message changes; bursts are coalesced into one redraw"""
+        self._pending_status = message
+        if self._status_after is None:
+            self._status_after = self.root.after_idle(self._flush_status)
+    
+    def _flush_status(self):
+        """Show the latest queued status message"""
+        self._status_after = None
+        message, self._pending_status = self._pending_status, None
+        if message is not None:
+            self.status_var.set(message)
     
     def on_error(self, error_message: str):
         """Called when an error occurs"""
@@ -338,6 +401,9 @@ class MainWindowRefactored:
     # UI update methods (simplified from original)
     def update_portfolio_display(self):
         """Update portfolio table display"""
+        # Any filter still running in the background is now out of date
+        self._filter_token += 1
+        
         # Get filtered and sorted stocks from controller
         search_term = self.search_var.get()
         sort_field = self.sort_var.get()
@@ -347,53 +413,101 @@ class MainWindowRefactored:
             sort_field=sort_field,
             ascending=self.sort_ascending
         )
-        
-        # Clear and repopulate tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
+        self.render_portfolio_rows(filtered_stocks)
+    
+    def render_portfolio_rows(self, filtered_stocks: List[Stock]):
+        """Sync the portfolio table with an already filtered and sorted stock list"""
+        # Diff against the rows already in the tree so unchanged rows cost no Tk calls
+        order = []
+        rows = {}
+        today = datetime.now().date()
         for stock in filtered_stocks:
-            values = [
-                stock.symbol,
-                FormatHelper.truncate_text(stock.company_name or "", 20),
-                FormatHelper.format_number(stock.quantity, 0),
-                FormatHelper.format_currency(stock.purchase_price),
-                FormatHelper.format_currency(stock.current_price or 0),
-                FormatHelper.format_currency(stock.actual_cash_invested),
-                FormatHelper.format_currency(stock.total_investment),
-                FormatHelper.format_currency(stock.current_value),
-                FormatHelper.format_currency(stock.profit_loss_amount),
-                FormatHelper.format_percentage(stock.profit_loss_percentage),
-                str(stock.days_held)
-            ]
-            
-            # Apply profit/loss coloring
-            tags = []
-            if stock.current_price is not None:
-                if stock.profit_loss_amount > 0:
-                    tags.append("profit")
-                    values[8] = f"+{FormatHelper.format_currency(stock.profit_loss_amount)[1:]}"
-                elif stock.profit_loss_amount < 0:
-                    tags.append("loss")
-            
-            self.tree.insert("", "end", values=values, tags=tags)
+            iid = self._row_iid(stock)
+            order.append(iid)
+            rows[iid] = self._cached_row(iid, stock, today)
+        
+        existing = self.tree.get_children()
+        stale = [iid for iid in existing if iid not in rows]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                self._row_cache.pop(iid, None)
+                self._formatted_cache.pop(iid, None)
+        
+        existing = set(existing)
+        # Call the Tcl insert command directly to skip ttk.Treeview.insert's option parsing
+        tree_call = self.tree.tk.call
+        tree_path = self.tree._w
+        for index, iid in enumerate(order):
+            values, tags = rows[iid]
+            if iid not in existing:
+                tree_call(tree_path, "insert", "", index, "-id", iid,
+                          "-values", values, "-tags", tags)
+            elif self._row_cache.get(iid) != (values, tags):
+                self.tree.item(iid, values=values, tags=tags)
+            self._row_cache[iid] = (values, tags)
+        
+        # Reorder only when the sort/filter actually changed the sequence
+        if self.tree.get_children() != tuple(order):
+            for index, iid in enumerate(order):
+                self.tree.move(iid, "", index)
+    
+    def _clear_row_caches(self):
+        """Forget every cached row ahead of a full portfolio reload"""
+        self._row_cache.clear()
+        self._formatted_cache.clear()
+    
+    @staticmethod
+    def _row_iid(stock: Stock) -> str:
+        """Stable tree item id for a stock row"""
+        return str(stock.id) if stock.id is not None else stock.symbol
+    
+    def _cached_row(self, iid: str, stock: Stock, today):
+        """Return the formatted row, reusing the last one if its inputs are unchanged"""
+        signature = (stock.symbol, stock.company_name, stock.quantity, stock.purchase_price,
+                     stock.purchase_date, stock.cash_invested, stock.current_price, today)
+        cached = self._formatted_cache.get(iid)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+        
+        values, tags = self._format_row(stock)
+        self._formatted_cache[iid] = (signature, values, tags)
+        return values, tags
+    
+    @staticmethod
+    def _format_row(stock: Stock):
+        """Build the (values, tags) pair displayed for a stock"""
+        values = [
+            stock.symbol,
+            FormatHelper.truncate_text(stock.company_name or "", 20),
+            FormatHelper.format_number(stock.quantity, 0),
+            FormatHelper.format_currency(stock.purchase_price),
+            FormatHelper.format_currency(stock.current_price or 0),
+            FormatHelper.format_currency(stock.actual_cash_invested),
+            FormatHelper.format_currency(stock.total_investment),
+            FormatHelper.format_currency(stock.current_value),
+            FormatHelper.format_currency(stock.profit_loss_amount),
+            FormatHelper.format_percentage(stock.profit_loss_percentage),
+            str(stock.days_held)
+        ]
         
-        # Configure tag colors
-        self.tree.tag_configure("profit", foreground=AppConfig.COLORS['profit'])
-        self.tree.tag_configure("loss", foreground=AppConfig.COLORS['loss'])
+        # Apply profit/loss coloring
+        tags = ()
+        if stock.current_price is not None:
+            if stock.profit_loss_amount > 0:
+                tags = ("profit",)
+                values[8] = f"+{FormatHelper.format_currency(stock.profit_loss_amount)[1:]}"
+            elif stock.profit_loss_amount < 0:
+                tags = ("loss",)
+        
+        return tuple(values), tags
     
     def update_dashboard(self):
         """Update dashboard metrics"""
-        # Clear existing cards
-        for card in self.metric_cards.values():
-            card.destroy()
-        self.metric_cards.clear()
+        if self._snapshot['metrics'] is None:
+            self.refresh_snapshot()
+        metrics = self._snapshot['metrics']
         
-        # Get metrics from controller
-        stocks = self.portfolio_controller.get_stocks()
-        metrics = MetricCalculator.calculate_portfolio_metrics(stocks)
-        
-        # Create metric cards
         cards_data = [
             ("Total Investment", MetricCalculator.format_currency(metrics['total_investment']), None, None),
             ("Current Value", MetricCalculator.format_currency(metrics['current_value']), None, None),
@@ -403,9 +517,19 @@ class MainWindowRefactored:
             ("Total Stocks", str(metrics['total_stocks']), None, None)
         ]
         
+        if not self.metric_cards:
+            self.create_metric_cards(cards_data)
+            return
+        
+        # Cards already exist - only their label text changes
+        for title, value, change, change_type in cards_data:
+            self.metric_cards[title].update(value, change, change_type)
+    
+    def create_metric_cards(self, cards_data):
+        """Create the dashboard metric cards once and keep handles to their labels"""
         for i, (title, value, change, change_type) in enumerate(cards_data):
             card = ModernUI.create_metric_card(self.metrics_frame, title, value, change, change_type)
-            card.grid(row=0, column=i, padx=(0, 15) if i < len(cards_data)-1 else 0, sticky="ew")
+            card.frame.grid(row=0, column=i, padx=(0, 15) if i < len(cards_data)-1 else 0, sticky="ew")
             self.metric_cards[title] = card
         
         # Configure column weights
@@ -413,17 +537,29 @@ class MainWindowRefactored:
             self.metrics_frame.grid_columnconfigure(i, weight=1)
     
     def update_cash_balance(self):
-        """Update cash balance display"""
+        """Update cash balance display, querying the database only after cash may have changed"""
+        if not self._cash_balance_dirty:
+            return
         try:
             balance = self.db_manager.get_current_cash_balance()
+            self._cash_balance_dirty = False
+            if balance == self._last_cash:
+                return
             self.cash_balance_var.set(f"Available Cash: {FormatHelper.format_currency(balance)}")
+            self._last_cash = balance
         except Exception as e:
             self.cash_balance_var.set("Available Cash: ₹0.00")
+            self._last_cash = None
+    
+    def invalidate_cash_balance(self):
+        """Mark the cached cash balance stale so the next update re-reads it"""
+        self._cash_balance_dirty = True
     
     # Action methods (simplified - delegate to controller)
     def add_stock(self):
         """Add new stock"""
         try:
+            from gui.add_stock_dialog import AddStockDialog
             dialog = AddStockDialog(self.root)
             self.root.wait_window(dialog.dialog)
             
@@ -431,6 +567,7 @@ class MainWindowRefactored:
                 success = self.portfolio_controller.add_stock(dialog.result)
                 if success:
                     messagebox.showinfo("Success", f"Added {dialog.result['symbol']} to portfolio")
+                    self.invalidate_cash_balance()
                     self.update_cash_balance()
         except Exception as e:
             self.on_error(f"Failed to add stock: {str(e)}")
@@ -454,10 +591,12 @@ class MainWindowRefactored:
                 return
             
             # Create edit dialog
+            from gui.add_stock_dialog import AddStockDialog
             dialog = AddStockDialog(self.root, stock)
             self.root.wait_window(dialog.dialog)
             
             if dialog.result:
+                self._formatted_cache.pop(self._row_iid(stock), None)
                 success = self.portfolio_controller.update_stock(stock.id, dialog.result)
                 if success:
                     messagebox.showinfo("Success", f"Updated {symbol}")
@@ -478,6 +617,7 @@ class MainWindowRefactored:
             if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {symbol}?"):
                 stock = self.portfolio_controller.find_stock_by_symbol(symbol)
                 if stock:
+                    self._formatted_cache.pop(self._row_iid(stock), None)
                     success = self.portfolio_controller.delete_stock(stock.id, symbol)
                     if success:
                         messagebox.showinfo("Success", f"Deleted {symbol}")
@@ -492,13 +632,16 @@ class MainWindowRefactored:
         
         def refresh_callback(success: bool, message: str):
             if success:
+                self.invalidate_cash_balance()
                 self.update_cash_balance()
         
         self.portfolio_controller.refresh_prices_async(callback=refresh_callback)
     
     def refresh_portfolio(self):
         """Refresh entire portfolio"""
+        self._clear_row_caches()
         self.portfolio_controller.load_portfolio()
+        self.invalidate_cash_balance()
         self.update_cash_balance()
     
     def export_portfolio(self):
@@ -522,24 +665,72 @@ class MainWindowRefactored:
         selected_user = self.user_var.get()
         if selected_user and selected_user in self.user_mapping:
             user_id = self.user_mapping[selected_user]
+            if user_id == self._active_user_id:
+                return  # Re-selecting the current user changes nothing
+            self._active_user_id = user_id
             self.db_manager.set_active_user(user_id)
+            self._clear_row_caches()
             self.portfolio_controller.load_portfolio()
+            self.invalidate_cash_balance()
             self.update_cash_balance()
     
     def on_search_changed(self, *args):
         """Handle search text changes"""
-        self.update_portfolio_display()
+        self._schedule_search_update()
     
     def on_sort_changed(self, event=None):
         """Handle sort field changes"""
-        self.update_portfolio_display()
+        self._schedule_search_update()
+    
+    def _schedule_search_update(self):
+        """Coalesce bursts of search/sort edits into a single table rebuild"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(
+            AppConfig.SEARCH_DEBOUNCE_MS, self._do_search_update
+        )
+    
+    def _do_search_update(self):
+        """Filter and sort on the worker thread, then render on the Tk thread"""
+        self._search_after_id = None
+        if self._pending_filter is not None:
+            self._pending_filter.cancel()
+        
+        self._filter_token += 1
+        token = self._filter_token
+        future = self._filter_executor.submit(
+            self.portfolio_controller.get_filtered_sorted_stocks,
+            search_term=self.search_var.get(),
+            sort_field=self.sort_var.get(),
+            ascending=self.sort_ascending
+        )
+        self._pending_filter = future
+        future.add_done_callback(lambda f: self._on_filter_done(f, token))
+    
+    def _on_filter_done(self, future, token: int):
+        """Marshal a finished filter result back to the Tk thread"""
+        if future.cancelled():
+            return
+        try:
+            filtered_stocks = future.result()
+        except Exception as e:
+            self.root.after(0, self.on_error, f"Failed to filter portfolio: {str(e)}")
+            return
+        self.root.after(0, self._apply_filtered, token, filtered_stocks)
+    
+    def _apply_filtered(self, token: int, filtered_stocks: List[Stock]):
+        """Render a filter result unless a newer request has superseded it"""
+        if token != self._filter_token:
+            return
+        self._pending_filter = None
+        self.render_portfolio_rows(filtered_stocks)
     
     def toggle_sort_order(self):
         """Toggle sort order"""
         self.sort_ascending = not self.sort_ascending
         sort_text = "↑ Asc" if self.sort_ascending else "↓ Desc"
         self.sort_order_btn.configure(text=sort_text)
-        self.update_portfolio_display()
+        self._do_search_update()
     
     def clear_search(self):
         """Clear search field"""
@@ -550,7 +741,9 @@ class MainWindowRefactored:
         """Open cash management dialog"""
         try:
             from gui.cash_management_dialog import CashManagementDialog
-            CashManagementDialog(self.root)
+            dialog = CashManagementDialog(self.root)
+            self.root.wait_window(dialog.dialog)
+            self.invalidate_cash_balance()
             self.update_cash_balance()
         except Exception as e:
             self.on_error(f"Failed to open cash management: {str(e)}")
@@ -597,6 +790,8 @@ class MainWindowRefactored:
             self.root.quit()
         finally:
             # Clean up resources
+            self._filter_executor.shutdown(wait=False, cancel_futures=True)
+            self.portfolio_controller.shutdown()
             if hasattr(self.db_manager, 'close'):
                 self.db_manager.close()
 
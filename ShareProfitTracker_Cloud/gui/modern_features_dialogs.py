@@ -5,31 +5,240 @@ Simple GUI dialogs for AI Advisor, Price Alerts, Rebalancing, and Tax Optimizati
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-from typing import List
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date
+from enum import IntEnum
+from typing import List, Tuple
+import numpy as np
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.models import Stock
 from utils.helpers import FormatHelper
+from gui.modern_ui import ModernUI
+
+
+class _AlertChoice(IntEnum):
+    """Alert types, in the order the add-alert combobox lists them"""
+    STOP_LOSS = 0
+    TARGET = 1
+    PCT_DROP = 2
+    PCT_RISE = 3
+
+
+_ALERT_CHOICE_LABELS = ("Stop Loss", "Target Price", "Price Drop %", "Price Rise %")
+_PERCENT_ALERT_CHOICES = frozenset({_AlertChoice.PCT_DROP, _AlertChoice.PCT_RISE})
+
+
+@dataclass
+class _PortfolioAggregates:
+    """Per-stock figures as arrays parallel to the stock list, plus portfolio totals"""
+    values: np.ndarray
+    investments: np.ndarray
+    pnls: np.ndarray
+    days: np.ndarray
+    total_value: float
+    total_investment: float
+
+    @property
+    def total_pnl(self) -> float:
+        return self.total_value - self.total_investment
+
+    def allocation_pct(self) -> np.ndarray:
+        """Share of total portfolio value held in each stock"""
+        if self.total_value > 0:
+            return self.values / self.total_value * 100
+        return np.zeros_like(self.values)
+
+    def tax_breakdown(self) -> Tuple[float, float, np.ndarray, np.ndarray]:
+        """Short/long-term gains plus indices of loss-making and near-LTCG holdings"""
+        short_mask = self.days < 365
+        gain_mask = self.pnls > 0
+        return (float(self.pnls[short_mask].sum()),
+                float(self.pnls[~short_mask].sum()),
+                np.flatnonzero(self.pnls < 0),
+                np.flatnonzero(short_mask & gain_mask & (self.days >= 300)))
+
+
+def _days_held(stock: Stock, today: date) -> int:
+    """Stock.days_held against a shared date; ISO dates skip strptime and the clock read"""
+    try:
+        return (today - date.fromisoformat(stock.purchase_date)).days
+    except (TypeError, ValueError):
+        return stock.days_held
+
+
+def _compute_aggregates(stocks: List[Stock]) -> _PortfolioAggregates:
+    """Evaluate each stock's computed properties once for an analysis pass"""
+    count = len(stocks)
+    today = date.today()
+    values = np.fromiter((stock.current_value for stock in stocks), dtype=np.float64, count=count)
+    investments = np.fromiter((stock.total_investment for stock in stocks), dtype=np.float64, count=count)
+    days = np.fromiter((_days_held(stock, today) for stock in stocks), dtype=np.int64, count=count)
+    return _PortfolioAggregates(values, investments, values - investments, days,
+                                float(values.sum()), float(investments.sum()))
+
+
+_PRESET_QUESTIONS = (
+    "How is my portfolio performing?",
+    "Should I rebalance my portfolio?",
+    "What are the tax implications of selling?",
+    "Which stocks are underperforming?",
+    "What's my risk exposure?"
+)
+
+_WELCOME_TEMPLATE = """Welcome to your AI Financial Advisor! 🤖
 
+I can help you with:
+• Portfolio analysis and performance review
+• Investment recommendations
+• Risk assessment and diversification
+• Tax planning strategies
+• Market insights and trends
+
+Your current portfolio: {count} stocks
+Total portfolio value: {value}
+
+Ask me anything about your investments!
+
+""" + "=" * 60 + "\n\n"
+
+_STRATEGIES_TEXT = """REBALANCING STRATEGIES
+========================
+
+1. EQUAL WEIGHT STRATEGY
+   - Allocate equal percentages to all holdings
+   - Reduces concentration risk
+   - Simple to maintain
+
+2. MARKET CAP WEIGHTED
+   - Weight by company market capitalization
+   - Follows market momentum
+   - Natural concentration in large caps
+
+3. RISK PARITY
+   - Equal risk contribution from each position
+   - Balances volatility across holdings
+   - More stable returns
+
+4. SECTOR BALANCED
+   - Target sector allocations
+   - Technology: 30%
+   - Financial: 25%
+   - Healthcare: 15%
+   - Energy: 15%
+   - Others: 15%
+
+RECOMMENDATION:
+Consider rebalancing if any single position exceeds 25% of total portfolio value.
+"""
+
+_TAX_GAINS_TEMPLATE = """TAX OPTIMIZATION ANALYSIS
+========================
+
+CURRENT TAX YEAR: 2024-25 (Indian Tax Laws)
+
+CAPITAL GAINS BREAKDOWN:
 
-class AIAdvisorDialog:
+Short-term Holdings (<1 year):
+Total Unrealized Gains: {short_gains}
+Tax Rate: 15.6% (15% + 4% cess)
+Potential Tax Liability: {short_tax}
+
+Long-term Holdings (≥1 year):
+Total Unrealized Gains: {long_gains}
+Tax Rate: 10.4% (10% + 4% cess) above ₹1 lakh
+"""
+
+_TAX_STRATEGIES_HEADER = """
+==================================================
+TAX OPTIMIZATION STRATEGIES:
+==================================================
+
+1. LOSS HARVESTING:
+"""
+
+_TAX_REPORT_FOOTER = """   • Consider spreading sales across financial years
+   • Plan major transactions before March 31st
+
+4. PORTFOLIO REBALANCING:
+   • Use fresh investments for rebalancing
+   • Avoid unnecessary sales in high-gain positions
+   • Consider SIP approach for new positions
+
+5. RECORD KEEPING:
+   ✓ Maintain detailed purchase records
+   ✓ Track corporate actions (splits, bonuses)
+   ✓ Document all transaction costs
+   ✓ Keep dividend tax certificates (Form 16A)
+
+⚠️ DISCLAIMER:
+This analysis is for informational purposes only.
+Please consult a qualified tax advisor for specific advice.
+Tax laws may change and individual situations vary.
+"""
+
+_dialog_pool = {}  # (dialog class, parent path) -> reusable instance
+
+
+class _PooledDialog(ABC):
+    """Keeps one dialog per parent: closing hides it, reopening refreshes its data"""
+
+    @classmethod
+    def open(cls, parent, service, stocks: List[Stock]):
+        """Show the pooled dialog for parent, building it only the first time"""
+        key = (cls, str(parent))
+        instance = _dialog_pool.get(key)
+        if instance is not None and instance.dialog.winfo_exists():
+            instance.attach(service, stocks)
+            instance.dialog.deiconify()
+            instance.dialog.grab_set()
+            return instance
+
+        instance = cls(parent, service, stocks)
+        _dialog_pool[key] = instance
+        return instance
+
+    @abstractmethod
+    def attach(self, service, stocks: List[Stock]):
+        """Rebind the dialog to fresh data before it is shown again"""
+
+    def show_modal(self, parent):
+        """Map the fully built dialog in one go, then make it modal"""
+        if parent is not None:
+            self.dialog.transient(parent)
+        self.center_dialog()
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+
+    def close_dialog(self):
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+
+
+class AIAdvisorDialog(_PooledDialog):
     """Dialog for AI Financial Advisor"""
 
+    _SEPARATOR = "-" * 60 + "\n\n"
+
     def __init__(self, parent, ai_advisor, stocks: List[Stock]):
         self.parent = parent
         self.ai_advisor = ai_advisor
         self.stocks = stocks
+        self._agg = _compute_aggregates(stocks)
+        self._awaiting_response = False
+        self._session = 0  # bumped on reopen so late answers are dropped
 
         self.dialog = tk.Toplevel(parent)
+        self.dialog.withdraw()  # stay unmapped until fully built
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close_dialog)
         self.setup_dialog()
         self.create_widgets()
 
-        # Make dialog modal
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        self.center_dialog()
+        self.show_modal(parent)
 
     def setup_dialog(self):
         self.dialog.title("🤖 AI Financial Advisor")
@@ -67,15 +276,7 @@ class AIAdvisorDialog:
         preset_frame = ttk.LabelFrame(main_frame, text="Quick Questions", padding="10")
         preset_frame.pack(fill="x", pady=(10, 0))
 
-        preset_questions = [
-            "How is my portfolio performing?",
-            "Should I rebalance my portfolio?",
-            "What are the tax implications of selling?",
-            "Which stocks are underperforming?",
-            "What's my risk exposure?"
-        ]
-
-        for i, question in enumerate(preset_questions):
+        for i, question in enumerate(_PRESET_QUESTIONS):
             btn = ttk.Button(preset_frame, text=question,
                            command=lambda q=question: self.ask_preset_question(q))
             btn.pack(side="left" if i < 3 else "right", padx=5, pady=2)
@@ -86,22 +287,22 @@ class AIAdvisorDialog:
         # Show initial welcome message
         self.show_welcome_message()
 
-    def show_welcome_message(self):
-        welcome_msg = f"""Welcome to your AI Financial Advisor! 🤖
-
-I can help you with:
-• Portfolio analysis and performance review
-• Investment recommendations
-• Risk assessment and diversification
-• Tax planning strategies
-• Market insights and trends
-
-Your current portfolio: {len(self.stocks)} stocks
-Total portfolio value: {FormatHelper.format_currency(sum(stock.current_value for stock in self.stocks))}
+    def attach(self, ai_advisor, stocks: List[Stock]):
+        self.ai_advisor = ai_advisor
+        self.stocks = stocks
+        self._agg = _compute_aggregates(stocks)
+        self._session += 1
+        self._awaiting_response = False
+        self.question_var.set("")
+        self.chat_text.delete(1.0, tk.END)
+        self.show_welcome_message()
 
-Ask me anything about your investments!
-"""
-        self.chat_text.insert(tk.END, welcome_msg + "\n" + "="*60 + "\n\n")
+    def show_welcome_message(self):
+        welcome_msg = _WELCOME_TEMPLATE.format(
+            count=len(self.stocks),
+            value=FormatHelper.format_currency(self._agg.total_value)
+        )
+        self.chat_text.insert(tk.END, welcome_msg)
 
     def ask_preset_question(self, question):
         self.question_var.set(question)
@@ -109,42 +310,63 @@ Ask me anything about your investments!
 
     def ask_question(self):
         question = self.question_var.get().strip()
-        if not question:
+        if not question or self._awaiting_response:
             return
 
-        # Show user question
-        self.chat_text.insert(tk.END, f"You: {question}\n\n")
-        self.chat_text.see(tk.END)
-
         # Clear input
         self.question_var.set("")
 
-        # Show thinking message
-        self.chat_text.insert(tk.END, "AI: Analyzing your portfolio... 🤔\n")
+        # Show user question and thinking message; the "thinking" tag marks
+        # the placeholder so it can be replaced without line arithmetic
+        self.chat_text.insert(tk.END, f"You: {question}\n\n", (),
+                              "AI: Analyzing your portfolio... 🤔\n", "thinking")
         self.chat_text.see(tk.END)
-        self.chat_text.update()
+        self.chat_text.update_idletasks()
 
+        # Get AI response with portfolio context off the UI thread
+        self._awaiting_response = True
         try:
-            # Get AI response with portfolio context
             portfolio_data = self.prepare_portfolio_context()
-            response = self.ai_advisor.get_advice(question, portfolio_data)
+        except Exception as e:
+            self._finish_response(None, e, self._session)
+            return
 
-            # Replace thinking message with actual response
-            self.chat_text.delete("end-2l", "end-1l")
-            self.chat_text.insert(tk.END, f"AI: {response}\n\n")
-            self.chat_text.insert(tk.END, "-" * 60 + "\n\n")
+        session = self._session
+        ai_advisor = self.ai_advisor
 
-        except Exception as e:
-            self.chat_text.delete("end-2l", "end-1l")
-            self.chat_text.insert(tk.END, f"AI: I'm having trouble processing your request right now. Error: {str(e)}\n\n")
+        def get_advice_async():
+            try:
+                response = ai_advisor.get_advice(question, portfolio_data)
+                error = None
+            except Exception as e:
+                response, error = None, e
+            self.dialog.after(0, lambda: self._finish_response(response, error, session))
+
+        threading.Thread(target=get_advice_async, daemon=True).start()
+
+    def _finish_response(self, response, error, session):
+        """Replace the thinking message with the advisor's answer"""
+        if session != self._session:
+            return  # asked before the dialog was closed and reopened
+        self._awaiting_response = False
+        if not self.dialog.winfo_exists():
+            return
+
+        self.chat_text.delete("thinking.first", "thinking.last")
+        if error is None:
+            message = f"AI: {response}\n\n{self._SEPARATOR}"
+        else:
+            message = f"AI: I'm having trouble processing your request right now. Error: {str(error)}\n\n"
+        self.chat_text.insert(tk.END, message)
 
         self.chat_text.see(tk.END)
 
     def prepare_portfolio_context(self):
         """Prepare portfolio data for AI analysis"""
-        total_value = sum(stock.current_value for stock in self.stocks)
-        total_investment = sum(stock.total_investment for stock in self.stocks)
-        total_pnl = total_value - total_investment
+        agg = self._agg
+        total_value = agg.total_value
+        total_investment = agg.total_investment
+        total_pnl = agg.total_pnl
 
         return {
             'stocks': [{
@@ -153,12 +375,14 @@ Ask me anything about your investments!
                 'quantity': stock.quantity,
                 'current_price': stock.current_price,
                 'purchase_price': stock.purchase_price,
-                'current_value': stock.current_value,
-                'investment': stock.total_investment,
-                'pnl_amount': stock.profit_loss_amount,
-                'pnl_percentage': stock.profit_loss_percentage,
-                'days_held': stock.days_held
-            } for stock in self.stocks],
+                'current_value': value,
+                'investment': investment,
+                'pnl_amount': pnl,
+                'pnl_percentage': (pnl / investment * 100) if investment else 0,
+                'days_held': days
+            } for stock, value, investment, pnl, days
+                in zip(self.stocks, agg.values.tolist(), agg.investments.tolist(),
+                       agg.pnls.tolist(), agg.days.tolist())],
             'summary': {
                 'total_stocks': len(self.stocks),
                 'total_value': total_value,
@@ -169,32 +393,39 @@ Ask me anything about your investments!
         }
 
     def center_dialog(self):
-        self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() - self.dialog.winfo_reqwidth()) // 2
-        y = (self.dialog.winfo_screenheight() - self.dialog.winfo_reqheight()) // 2
-        self.dialog.geometry(f"+{x}+{y}")
-
-    def close_dialog(self):
-        self.dialog.destroy()
+        ModernUI.center_dialog(self.dialog, 800, 600)
 
 
-class PriceAlertsDialog:
+class PriceAlertsDialog(_PooledDialog):
     """Dialog for Price Alerts Management"""
 
     def __init__(self, parent, price_alerts, stocks: List[Stock]):
         self.parent = parent
         self.price_alerts = price_alerts
-        self.stocks = stocks
+        self.set_stocks(stocks)
 
         self.dialog = tk.Toplevel(parent)
+        self.dialog.withdraw()  # stay unmapped until fully built
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close_dialog)
         self.setup_dialog()
         self.create_widgets()
-        self.load_alerts()
+        # Fill the rows once the dialog has painted
+        self.dialog.after_idle(self.load_alerts)
 
-        # Make dialog modal
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        self.center_dialog()
+        self.show_modal(parent)
+
+    def set_stocks(self, stocks: List[Stock]):
+        self.stocks = stocks
+        # Combobox rows map back to stocks by position, not by display text
+        self._combo_stocks = list(stocks)
+
+    def attach(self, price_alerts, stocks: List[Stock]):
+        self.price_alerts = price_alerts
+        self.set_stocks(stocks)
+        children = self.alerts_tree.get_children()
+        if children:
+            self.alerts_tree.delete(*children)
+        self.load_alerts()
 
     def setup_dialog(self):
         self.dialog.title("🔔 Price Alerts Management")
@@ -253,8 +484,12 @@ class PriceAlertsDialog:
             ("INFY.NS", "Stop Loss", "1400", "1450", "Triggered"),
         ]
 
+        # Straight Tcl inserts skip ttk's per-row option handling; all rows go in
+        # within one idle callback, so Tk lays them out in a single redraw
+        tree_call = self.alerts_tree.tk.call
+        tree_path = self.alerts_tree._w
         for alert in sample_alerts:
-            self.alerts_tree.insert("", "end", values=alert)
+            tree_call(tree_path, "insert", "", "end", "-values", alert)
 
     def add_alert(self):
         """Open dialog to add a new price alert"""
@@ -272,17 +507,15 @@ class PriceAlertsDialog:
         ttk.Label(frame, text="Select Stock:").grid(row=0, column=0, sticky="w", pady=5)
         stock_var = tk.StringVar()
         stock_combo = ttk.Combobox(frame, textvariable=stock_var, width=25)
-        stock_symbols = [f"{s.symbol} - {s.company_name}" for s in self.stocks] if self.stocks else ["No stocks in portfolio"]
-        stock_combo['values'] = stock_symbols
-        if stock_symbols:
-            stock_combo.current(0)
+        stock_combo['values'] = [f"{s.symbol} - {s.company_name}" for s in self._combo_stocks] or ["No stocks in portfolio"]
+        stock_combo.current(0)
         stock_combo.grid(row=0, column=1, pady=5, padx=(10, 0))
 
         # Alert type
         ttk.Label(frame, text="Alert Type:").grid(row=1, column=0, sticky="w", pady=5)
-        alert_type_var = tk.StringVar(value="Stop Loss")
+        alert_type_var = tk.StringVar(value=_ALERT_CHOICE_LABELS[_AlertChoice.STOP_LOSS])
         alert_type_combo = ttk.Combobox(frame, textvariable=alert_type_var, width=25)
-        alert_type_combo['values'] = ["Stop Loss", "Target Price", "Price Drop %", "Price Rise %"]
+        alert_type_combo['values'] = _ALERT_CHOICE_LABELS
         alert_type_combo.grid(row=1, column=1, pady=5, padx=(10, 0))
 
         # Target value
@@ -296,15 +529,33 @@ class PriceAlertsDialog:
         current_price_label = ttk.Label(frame, text="₹0.00")
         current_price_label.grid(row=3, column=1, sticky="w", pady=5, padx=(10, 0))
 
+        def selected_stock():
+            # current() is -1 when the typed text matches no row
+            index = stock_combo.current()
+            if 0 <= index < len(self._combo_stocks):
+                return self._combo_stocks[index]
+            return None
+
         def update_current_price(*args):
-            if self.stocks and stock_var.get():
-                symbol = stock_var.get().split(" - ")[0]
-                for stock in self.stocks:
-                    if stock.symbol == symbol:
-                        current_price_label.config(text=f"₹{stock.current_price:,.2f}")
-                        break
-
-        stock_var.trace('w', update_current_price)
+            stock = selected_stock()
+            if stock:
+                current_price_label.config(text=f"₹{stock.current_price:,.2f}")
+
+        # Typing into the combobox fires the trace per keystroke; refresh the
+        # label only once the input settles
+        pending_update = [None]  # after id of the queued label refresh
+
+        def run_price_update():
+            pending_update[0] = None
+            if add_dialog.winfo_exists():
+                update_current_price()
+
+        def schedule_price_update(*args):
+            if pending_update[0] is not None:
+                add_dialog.after_cancel(pending_update[0])
+            pending_update[0] = add_dialog.after(100, run_price_update)
+
+        stock_var.trace('w', schedule_price_update)
         update_current_price()
 
         # Notification method
@@ -315,7 +566,8 @@ class PriceAlertsDialog:
         notify_combo.grid(row=4, column=1, pady=5, padx=(10, 0))
 
         def save_alert():
-            if not stock_var.get() or stock_var.get() == "No stocks in portfolio":
+            stock = selected_stock()
+            if stock is None:
                 messagebox.showwarning("Warning", "Please select a stock")
                 return
             if not target_var.get():
@@ -327,9 +579,16 @@ class PriceAlertsDialog:
                 messagebox.showwarning("Warning", "Please enter a valid number for target value")
                 return
 
+            choice_index = alert_type_combo.current()
+            if choice_index < 0:
+                messagebox.showwarning("Warning", "Please select an alert type")
+                return
+            alert_choice = _AlertChoice(choice_index)
+            alert_label = _ALERT_CHOICE_LABELS[alert_choice]
+            is_percentage = alert_choice in _PERCENT_ALERT_CHOICES
+
             # Range validation for alert values
-            alert_type = alert_type_var.get()
-            if "%" in alert_type:
+            if is_percentage:
                 # Percentage-based alerts
                 if target_value <= 0 or target_value > 100:
                     messagebox.showwarning("Warning", "Percentage must be between 0.01% and 100%")
@@ -343,23 +602,19 @@ class PriceAlertsDialog:
                     messagebox.showwarning("Warning", "Target price exceeds maximum limit (₹1,00,00,000)")
                     return
 
-            symbol = stock_var.get().split(" - ")[0]
-            current_price = "N/A"
-            for stock in self.stocks:
-                if stock.symbol == symbol:
-                    current_price = f"₹{stock.current_price:,.2f}"
-                    break
+            symbol = stock.symbol
+            current_price = f"₹{stock.current_price:,.2f}"
 
             # Add to tree view
             self.alerts_tree.insert("", "end", values=(
                 symbol,
-                alert_type_var.get(),
-                f"₹{target_value:,.2f}" if "%" not in alert_type_var.get() else f"{target_value}%",
+                alert_label,
+                f"{target_value}%" if is_percentage else f"₹{target_value:,.2f}",
                 current_price,
                 "Active"
             ))
 
-            messagebox.showinfo("Success", f"Alert added for {symbol}!\n\nType: {alert_type_var.get()}\nTarget: {target_var.get()}")
+            messagebox.showinfo("Success", f"Alert added for {symbol}!\n\nType: {alert_label}\nTarget: {target_var.get()}")
             add_dialog.destroy()
 
         # Buttons
@@ -370,10 +625,7 @@ class PriceAlertsDialog:
         ttk.Button(button_frame, text="Cancel", command=add_dialog.destroy).pack(side="left")
 
         # Center dialog
-        add_dialog.update_idletasks()
-        x = (add_dialog.winfo_screenwidth() - add_dialog.winfo_reqwidth()) // 2
-        y = (add_dialog.winfo_screenheight() - add_dialog.winfo_reqheight()) // 2
-        add_dialog.geometry(f"+{x}+{y}")
+        ModernUI.center_dialog(add_dialog, 400, 350)
 
     def remove_alert(self):
         selected = self.alerts_tree.selection()
@@ -387,32 +639,34 @@ class PriceAlertsDialog:
         messagebox.showinfo("Test Notification", "📱 Test notification sent!\n\nThis would normally send:\n- Email notification\n- SMS alert (if configured)\n- Desktop popup\n- Push notification")
 
     def center_dialog(self):
-        self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() - self.dialog.winfo_reqwidth()) // 2
-        y = (self.dialog.winfo_screenheight() - self.dialog.winfo_reqheight()) // 2
-        self.dialog.geometry(f"+{x}+{y}")
-
-    def close_dialog(self):
-        self.dialog.destroy()
+        ModernUI.center_dialog(self.dialog, 700, 500)
 
 
-class RebalancingDialog:
+class RebalancingDialog(_PooledDialog):
     """Dialog for Portfolio Rebalancing"""
 
     def __init__(self, parent, rebalancer, stocks: List[Stock]):
         self.parent = parent
         self.rebalancer = rebalancer
         self.stocks = stocks
+        self._analysis = None
+        self._tab_builders = {}  # tab frame path -> builder, for tabs not yet shown
+        self._tab_views = {}  # tab frame path -> render method, for built tabs
+        self._stale_tabs = set()  # built tabs whose text predates the latest analysis
 
         self.dialog = tk.Toplevel(parent)
+        self.dialog.withdraw()  # stay unmapped until fully built
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close_dialog)
         self.setup_dialog()
         self.create_widgets()
         self.analyze_portfolio()
 
-        # Make dialog modal
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        self.center_dialog()
+        self.show_modal(parent)
+
+    def attach(self, rebalancer, stocks: List[Stock]):
+        self.rebalancer = rebalancer
+        self.stocks = stocks
+        self.analyze_portfolio()
 
     def setup_dialog(self):
         self.dialog.title("⚖️ Portfolio Rebalancing")
@@ -431,6 +685,8 @@ class RebalancingDialog:
         # Notebook for different strategies
         notebook = ttk.Notebook(main_frame)
         notebook.pack(fill="both", expand=True, pady=(0, 10))
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_change)
+        self.notebook = notebook
 
         # Current allocation tab
         self.create_current_allocation_tab(notebook)
@@ -455,30 +711,68 @@ class RebalancingDialog:
 
         self.allocation_text = scrolledtext.ScrolledText(frame, height=20, width=80, wrap=tk.WORD)
         self.allocation_text.pack(fill="both", expand=True, padx=10, pady=10)
+        self._tab_views[str(frame)] = self.show_current_allocation
 
     def create_strategies_tab(self, notebook):
         frame = ttk.Frame(notebook)
         notebook.add(frame, text="Strategies")
 
+        # Text widget is built on first visit to the tab
+        self.strategies_text = None
+        self._tab_builders[str(frame)] = lambda: self.build_strategies_tab(frame)
+
+    def build_strategies_tab(self, frame):
         self.strategies_text = scrolledtext.ScrolledText(frame, height=20, width=80, wrap=tk.WORD)
         self.strategies_text.pack(fill="both", expand=True, padx=10, pady=10)
+        self._tab_views[str(frame)] = self.show_strategies
+        if self._analysis is not None:
+            self.show_strategies(self._analysis)
 
     def create_recommendations_tab(self, notebook):
         frame = ttk.Frame(notebook)
         notebook.add(frame, text="Recommendations")
 
+        # Text widget is built on first visit to the tab
+        self.recommendations_text = None
+        self._tab_builders[str(frame)] = lambda: self.build_recommendations_tab(frame)
+
+    def build_recommendations_tab(self, frame):
         self.recommendations_text = scrolledtext.ScrolledText(frame, height=20, width=80, wrap=tk.WORD)
         self.recommendations_text.pack(fill="both", expand=True, padx=10, pady=10)
+        self._tab_views[str(frame)] = self.show_recommendations
+        if self._analysis is not None:
+            self.show_recommendations(self._analysis)
+
+    def _on_tab_change(self, event=None):
+        selected = self.notebook.select()
+        builder = self._tab_builders.pop(selected, None)
+        if builder:
+            builder()
+        elif selected in self._stale_tabs:
+            self._stale_tabs.discard(selected)
+            self._tab_views[selected](self._analysis)
+
+    def render_tabs(self):
+        """Redraw the visible tab now; other built tabs redraw when next selected"""
+        selected = self.notebook.select()
+        self._stale_tabs = set()
+        for path, render in self._tab_views.items():
+            if path == selected:
+                render(self._analysis)
+            else:
+                self._stale_tabs.add(path)
 
     def analyze_portfolio(self):
         """Analyze current portfolio and show rebalancing suggestions"""
         try:
+            # Recomputed on every (re)analysis so Refresh picks up new prices
+            self._agg = _compute_aggregates(self.stocks)
             portfolio_data = self.prepare_portfolio_data()
             analysis = self.rebalancer.analyze_portfolio(portfolio_data)
+            self._analysis = analysis
 
-            self.show_current_allocation(analysis)
-            self.show_strategies(analysis)
-            self.show_recommendations(analysis)
+            # Tabs not visited yet render when they are first built
+            self.render_tabs()
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to analyze portfolio: {str(e)}")
@@ -488,120 +782,86 @@ class RebalancingDialog:
         return {
             'stocks': [{
                 'symbol': stock.symbol,
-                'current_value': stock.current_value,
+                'current_value': value,
                 'quantity': stock.quantity,
                 'current_price': stock.current_price,
                 'sector': getattr(stock, 'sector', 'Unknown')
-            } for stock in self.stocks]
+            } for stock, value in zip(self.stocks, self._agg.values.tolist())]
         }
 
     def show_current_allocation(self, analysis):
-        total_value = sum(stock.current_value for stock in self.stocks)
+        total_value = self._agg.total_value
 
-        allocation_text = "CURRENT PORTFOLIO ALLOCATION\n"
-        allocation_text += "=" * 40 + "\n\n"
+        parts = ["CURRENT PORTFOLIO ALLOCATION\n"]
+        append = parts.append
+        fmt = FormatHelper.format_currency
+        append("=" * 40 + "\n\n")
 
-        for stock in self.stocks:
-            percentage = (stock.current_value / total_value) * 100 if total_value > 0 else 0
-            allocation_text += f"{stock.symbol:<15} {FormatHelper.format_currency(stock.current_value):<15} {percentage:>6.1f}%\n"
+        percentages = self._agg.allocation_pct().tolist()
+        parts.extend([f"{stock.symbol:<15} {fmt(value):<15} {percentage:>6.1f}%\n"
+                      for stock, value, percentage
+                      in zip(self.stocks, self._agg.values.tolist(), percentages)])
 
-        allocation_text += "\n" + "-" * 40 + "\n"
-        allocation_text += f"{'TOTAL':<15} {FormatHelper.format_currency(total_value):<15} {100.0:>6.1f}%\n\n"
+        append("\n" + "-" * 40 + "\n")
+        append(f"{'TOTAL':<15} {fmt(total_value):<15} {100.0:>6.1f}%\n\n")
 
-        allocation_text += "SECTOR BREAKDOWN:\n"
-        allocation_text += "(Based on estimated sectors)\n\n"
-        allocation_text += "Technology: ~45%\n"
-        allocation_text += "Financial: ~25%\n"
-        allocation_text += "Energy: ~20%\n"
-        allocation_text += "Others: ~10%\n"
+        append("SECTOR BREAKDOWN:\n")
+        append("(Based on estimated sectors)\n\n")
+        append("Technology: ~45%\n")
+        append("Financial: ~25%\n")
+        append("Energy: ~20%\n")
+        append("Others: ~10%\n")
 
         self.allocation_text.delete(1.0, tk.END)
-        self.allocation_text.insert(1.0, allocation_text)
+        self.allocation_text.insert(1.0, "".join(parts))
 
     def show_strategies(self, analysis):
-        strategies_text = """REBALANCING STRATEGIES
-========================
-
-1. EQUAL WEIGHT STRATEGY
-   - Allocate equal percentages to all holdings
-   - Reduces concentration risk
-   - Simple to maintain
-
-2. MARKET CAP WEIGHTED
-   - Weight by company market capitalization
-   - Follows market momentum
-   - Natural concentration in large caps
-
-3. RISK PARITY
-   - Equal risk contribution from each position
-   - Balances volatility across holdings
-   - More stable returns
-
-4. SECTOR BALANCED
-   - Target sector allocations
-   - Technology: 30%
-   - Financial: 25%
-   - Healthcare: 15%
-   - Energy: 15%
-   - Others: 15%
-
-RECOMMENDATION:
-Consider rebalancing if any single position exceeds 25% of total portfolio value.
-"""
-
         self.strategies_text.delete(1.0, tk.END)
-        self.strategies_text.insert(1.0, strategies_text)
+        self.strategies_text.insert(1.0, _STRATEGIES_TEXT)
 
     def show_recommendations(self, analysis):
-        total_value = sum(stock.current_value for stock in self.stocks)
+        total_value = self._agg.total_value
 
-        recommendations_text = "REBALANCING RECOMMENDATIONS\n"
-        recommendations_text += "=" * 30 + "\n\n"
+        parts = ["REBALANCING RECOMMENDATIONS\n"]
+        append = parts.append
+        append("=" * 30 + "\n\n")
 
         # Find overweight positions
-        overweight_stocks = []
-        for stock in self.stocks:
-            percentage = (stock.current_value / total_value) * 100 if total_value > 0 else 0
-            if percentage > 25:
-                overweight_stocks.append((stock.symbol, percentage))
+        percentages = self._agg.allocation_pct()
+        overweight_stocks = [(self.stocks[i].symbol, float(percentages[i]))
+                             for i in np.flatnonzero(percentages > 25)]
 
         if overweight_stocks:
-            recommendations_text += "🔴 OVERWEIGHT POSITIONS (>25%):\n"
+            append("🔴 OVERWEIGHT POSITIONS (>25%):\n")
             for symbol, pct in overweight_stocks:
-                recommendations_text += f"   {symbol}: {pct:.1f}% - Consider reducing by {pct-20:.1f}%\n"
-            recommendations_text += "\n"
+                append(f"   {symbol}: {pct:.1f}% - Consider reducing by {pct-20:.1f}%\n")
+            append("\n")
         else:
-            recommendations_text += "✅ No severely overweight positions detected.\n\n"
+            append("✅ No severely overweight positions detected.\n\n")
 
-        recommendations_text += "📈 GENERAL RECOMMENDATIONS:\n"
-        recommendations_text += "• Review allocation quarterly\n"
-        recommendations_text += "• Maintain emergency cash reserves\n"
-        recommendations_text += "• Consider tax implications before selling\n"
-        recommendations_text += "• Diversify across sectors and market caps\n"
-        recommendations_text += "• Rebalance when allocation drifts >5% from target\n\n"
+        append("📈 GENERAL RECOMMENDATIONS:\n")
+        append("• Review allocation quarterly\n")
+        append("• Maintain emergency cash reserves\n")
+        append("• Consider tax implications before selling\n")
+        append("• Diversify across sectors and market caps\n")
+        append("• Rebalance when allocation drifts >5% from target\n\n")
 
-        recommendations_text += "💡 TAX-EFFICIENT REBALANCING:\n"
-        recommendations_text += "• Use new investments to balance allocation\n"
-        recommendations_text += "• Harvest tax losses where applicable\n"
-        recommendations_text += "• Consider LTCG vs STCG implications\n"
+        append("💡 TAX-EFFICIENT REBALANCING:\n")
+        append("• Use new investments to balance allocation\n")
+        append("• Harvest tax losses where applicable\n")
+        append("• Consider LTCG vs STCG implications\n")
 
         self.recommendations_text.delete(1.0, tk.END)
-        self.recommendations_text.insert(1.0, recommendations_text)
+        self.recommendations_text.insert(1.0, "".join(parts))
 
     def export_report(self):
         messagebox.showinfo("Export Report", "Rebalancing report would be exported to PDF/Excel here.")
 
     def center_dialog(self):
-        self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() - self.dialog.winfo_reqwidth()) // 2
-        y = (self.dialog.winfo_screenheight() - self.dialog.winfo_reqheight()) // 2
-        self.dialog.geometry(f"+{x}+{y}")
-
-    def close_dialog(self):
-        self.dialog.destroy()
+        ModernUI.center_dialog(self.dialog, 800, 600)
 
 
-class TaxOptimizationDialog:
+class TaxOptimizationDialog(_PooledDialog):
     """Dialog for Tax Optimization"""
 
     def __init__(self, parent, tax_optimizer, stocks: List[Stock]):
@@ -610,14 +870,18 @@ class TaxOptimizationDialog:
         self.stocks = stocks
 
         self.dialog = tk.Toplevel(parent)
+        self.dialog.withdraw()  # stay unmapped until fully built
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close_dialog)
         self.setup_dialog()
         self.create_widgets()
         self.analyze_tax_situation()
 
-        # Make dialog modal
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        self.center_dialog()
+        self.show_modal(parent)
+
+    def attach(self, tax_optimizer, stocks: List[Stock]):
+        self.tax_optimizer = tax_optimizer
+        self.stocks = stocks
+        self.analyze_tax_situation()
 
     def setup_dialog(self):
         self.dialog.title("💰 Tax Optimization")
@@ -634,7 +898,8 @@ class TaxOptimizationDialog:
         title_label.pack(pady=(0, 20))
 
         # Tax analysis text
-        self.tax_text = scrolledtext.ScrolledText(main_frame, height=25, width=90, wrap=tk.WORD)
+        self.tax_text = scrolledtext.ScrolledText(main_frame, height=25, width=90, wrap=tk.WORD,
+                                                  state="disabled")
         self.tax_text.pack(fill="both", expand=True, pady=(0, 10))
 
         # Action buttons
@@ -649,14 +914,15 @@ class TaxOptimizationDialog:
     def analyze_tax_situation(self):
         """Analyze tax situation and show optimization strategies"""
         try:
+            # Recomputed on every (re)analysis so Refresh picks up new prices
+            self._agg = _compute_aggregates(self.stocks)
             portfolio_data = self.prepare_tax_data()
             analysis = self.tax_optimizer.analyze_tax_situation(portfolio_data)
 
             self.show_tax_analysis(analysis)
 
         except Exception as e:
-            self.tax_text.delete(1.0, tk.END)
-            self.tax_text.insert(1.0, f"Error analyzing tax situation: {str(e)}")
+            self.set_tax_text(f"Error analyzing tax situation: {str(e)}")
 
     def prepare_tax_data(self):
         """Prepare portfolio data for tax analysis"""
@@ -667,96 +933,69 @@ class TaxOptimizationDialog:
                 'purchase_price': stock.purchase_price,
                 'current_price': stock.current_price,
                 'purchase_date': stock.purchase_date,
-                'days_held': stock.days_held,
-                'unrealized_gain': stock.profit_loss_amount
-            } for stock in self.stocks]
+                'days_held': days,
+                'unrealized_gain': pnl
+            } for stock, days, pnl in zip(self.stocks, self._agg.days.tolist(), self._agg.pnls.tolist())]
         }
 
     def show_tax_analysis(self, analysis):
         """Display comprehensive tax analysis"""
-        tax_text = """TAX OPTIMIZATION ANALYSIS
-========================
-
-CURRENT TAX YEAR: 2024-25 (Indian Tax Laws)
-
-CAPITAL GAINS BREAKDOWN:
-"""
+        fmt = FormatHelper.format_currency
 
         # Calculate short-term and long-term gains
-        short_term_gains = 0
-        long_term_gains = 0
-
-        for stock in self.stocks:
-            if stock.days_held < 365:
-                short_term_gains += stock.profit_loss_amount
-            else:
-                long_term_gains += stock.profit_loss_amount
-
-        tax_text += f"\nShort-term Holdings (<1 year):\n"
-        tax_text += f"Total Unrealized Gains: {FormatHelper.format_currency(short_term_gains)}\n"
-        tax_text += f"Tax Rate: 15.6% (15% + 4% cess)\n"
-        tax_text += f"Potential Tax Liability: {FormatHelper.format_currency(max(0, short_term_gains * 0.156))}\n\n"
-
-        tax_text += f"Long-term Holdings (≥1 year):\n"
-        tax_text += f"Total Unrealized Gains: {FormatHelper.format_currency(long_term_gains)}\n"
-        tax_text += f"Tax Rate: 10.4% (10% + 4% cess) above ₹1 lakh\n"
+        agg = self._agg
+        short_term_gains, long_term_gains, loss_idx, near_ltcg_idx = agg.tax_breakdown()
+
+        parts = [_TAX_GAINS_TEMPLATE.format(
+            short_gains=fmt(short_term_gains),
+            short_tax=fmt(max(0, short_term_gains * 0.156)),
+            long_gains=fmt(long_term_gains)
+        )]
+        append = parts.append
         if long_term_gains > 100000:
             taxable_ltcg = long_term_gains - 100000
-            tax_text += f"Taxable Amount: {FormatHelper.format_currency(taxable_ltcg)}\n"
-            tax_text += f"Potential Tax Liability: {FormatHelper.format_currency(taxable_ltcg * 0.104)}\n"
+            append(f"Taxable Amount: {fmt(taxable_ltcg)}\n")
+            append(f"Potential Tax Liability: {fmt(taxable_ltcg * 0.104)}\n")
         else:
-            tax_text += f"Tax Liability: ₹0 (Below ₹1 lakh exemption)\n"
-
-        tax_text += "\n" + "="*50 + "\n"
-        tax_text += "TAX OPTIMIZATION STRATEGIES:\n"
-        tax_text += "="*50 + "\n\n"
+            append(f"Tax Liability: ₹0 (Below ₹1 lakh exemption)\n")
 
-        tax_text += "1. LOSS HARVESTING:\n"
-        loss_stocks = [stock for stock in self.stocks if stock.profit_loss_amount < 0]
+        append(_TAX_STRATEGIES_HEADER)
+        loss_stocks = [(self.stocks[i], float(agg.pnls[i])) for i in loss_idx]
         if loss_stocks:
-            tax_text += f"   📉 You have {len(loss_stocks)} stocks with unrealized losses:\n"
-            for stock in loss_stocks[:3]:  # Show top 3 losses
-                tax_text += f"   • {stock.symbol}: {FormatHelper.format_currency(stock.profit_loss_amount)}\n"
-            tax_text += "   💡 Consider selling loss-making stocks to offset gains\n\n"
+            append(f"   📉 You have {len(loss_stocks)} stocks with unrealized losses:\n")
+            for stock, pnl in loss_stocks[:3]:  # Show top 3 losses
+                append(f"   • {stock.symbol}: {fmt(pnl)}\n")
+            append("   💡 Consider selling loss-making stocks to offset gains\n\n")
         else:
-            tax_text += "   ✅ No loss-making positions for harvesting\n\n"
+            append("   ✅ No loss-making positions for harvesting\n\n")
 
-        tax_text += "2. HOLDING PERIOD OPTIMIZATION:\n"
-        near_ltcg_stocks = [stock for stock in self.stocks if 300 <= stock.days_held < 365 and stock.profit_loss_amount > 0]
+        append("2. HOLDING PERIOD OPTIMIZATION:\n")
+        near_ltcg_stocks = [(self.stocks[i], int(agg.days[i])) for i in near_ltcg_idx]
         if near_ltcg_stocks:
-            tax_text += f"   ⏰ {len(near_ltcg_stocks)} stocks nearing long-term status:\n"
-            for stock in near_ltcg_stocks:
-                days_to_ltcg = 365 - stock.days_held
-                tax_text += f"   • {stock.symbol}: {days_to_ltcg} days to LTCG status\n"
-            tax_text += "   💡 Consider holding for lower tax rates\n\n"
+            append(f"   ⏰ {len(near_ltcg_stocks)} stocks nearing long-term status:\n")
+            for stock, days in near_ltcg_stocks:
+                days_to_ltcg = 365 - days
+                append(f"   • {stock.symbol}: {days_to_ltcg} days to LTCG status\n")
+            append("   💡 Consider holding for lower tax rates\n\n")
         else:
-            tax_text += "   ✅ No positions nearing LTCG status\n\n"
+            append("   ✅ No positions nearing LTCG status\n\n")
 
-        tax_text += "3. ANNUAL PLANNING:\n"
-        tax_text += f"   • LTCG Exemption Available: ₹1,00,000 per year\n"
+        append("""3. ANNUAL PLANNING:
+   • LTCG Exemption Available: ₹1,00,000 per year
+""")
         if long_term_gains > 100000:
-            tax_text += f"   • Current LTCG above exemption: {FormatHelper.format_currency(long_term_gains - 100000)}\n"
-        tax_text += "   • Consider spreading sales across financial years\n"
-        tax_text += "   • Plan major transactions before March 31st\n\n"
-
-        tax_text += "4. PORTFOLIO REBALANCING:\n"
-        tax_text += "   • Use fresh investments for rebalancing\n"
-        tax_text += "   • Avoid unnecessary sales in high-gain positions\n"
-        tax_text += "   • Consider SIP approach for new positions\n\n"
-
-        tax_text += "5. RECORD KEEPING:\n"
-        tax_text += "   ✓ Maintain detailed purchase records\n"
-        tax_text += "   ✓ Track corporate actions (splits, bonuses)\n"
-        tax_text += "   ✓ Document all transaction costs\n"
-        tax_text += "   ✓ Keep dividend tax certificates (Form 16A)\n\n"
-
-        tax_text += "⚠️ DISCLAIMER:\n"
-        tax_text += "This analysis is for informational purposes only.\n"
-        tax_text += "Please consult a qualified tax advisor for specific advice.\n"
-        tax_text += "Tax laws may change and individual situations vary.\n"
+            append(f"   • Current LTCG above exemption: {fmt(long_term_gains - 100000)}\n")
+
+        # The fixed closing sections go in as their own segment rather than
+        # being copied into the joined per-holding text
+        self.set_tax_text("".join(parts), (), _TAX_REPORT_FOOTER)
 
+    def set_tax_text(self, *segments):
+        """Replace the read-only report text in one edit"""
+        self.tax_text.config(state="normal")
         self.tax_text.delete(1.0, tk.END)
-        self.tax_text.insert(1.0, tax_text)
+        self.tax_text.insert(tk.END, *segments)
+        self.tax_text.config(state="disabled")
 
     def open_tax_calculator(self):
         messagebox.showinfo("Tax Calculator", "Interactive tax calculator would open here.\n\nFeatures:\n• Calculate STCG/LTCG tax\n• Compare selling scenarios\n• Estimate annual tax liability\n• Plan optimal selling strategy")
@@ -765,10 +1004,4 @@ CAPITAL GAINS BREAKDOWN:
         messagebox.showinfo("Export Tax Report", "Detailed tax report would be exported here.\n\nIncludes:\n• Complete capital gains analysis\n• Tax optimization recommendations\n• Holding period calendar\n• Transaction history for filing")
 
     def center_dialog(self):
-        self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() - self.dialog.winfo_reqwidth()) // 2
-        y = (self.dialog.winfo_screenheight() - self.dialog.winfo_reqheight()) // 2
-        self.dialog.geometry(f"+{x}+{y}")
-
-    def close_dialog(self):
-        self.dialog.destroy()
\ No newline at end of file
+        ModernUI.center_dialog(self.dialog, 800, 600)
\ No newline at end of file
@@ -1,12 +1,45 @@
 import tkinter as tk
 from tkinter import ttk
 import platform
+from dataclasses import dataclass
+from typing import Optional
+from types import MappingProxyType
+from functools import lru_cache
+
+# (style, padding, font, background, light, dark, active, pressed, focus, black text in all states)
+_BUTTON_STYLE_SPECS = (
+    ('Modern.TButton', (12, 8), 'body_bold', 'lightgray', 'white', 'gray',
+     'silver', 'darkgray', 'lightblue', False),
+    ('Accent.TButton', (12, 8), 'body_bold', 'lightblue', 'white', 'steelblue',
+     'skyblue', 'steelblue', 'dodgerblue', True),
+    ('Success.TButton', (12, 8), 'body_bold', 'lightgreen', 'white', 'darkgreen',
+     'palegreen', 'darkgreen', 'limegreen', True),
+    ('Warning.TButton', (12, 8), 'body_bold', 'orange', 'yellow', 'darkorange',
+     'yellow', 'darkorange', 'gold', False),
+    ('Danger.TButton', (12, 8), 'body_bold', 'lightcoral', 'white', 'darkred',
+     'mistyrose', 'darkred', 'red', True),
+    ('Icon.TButton', (8, 6), 'body', 'lightsteelblue', 'white', 'steelblue',
+     'lightblue', 'steelblue', 'skyblue', False),
+)
+
+# State maps shared by every button style
+_PRESSED_RELIEF = (('pressed', 'sunken'), ('!pressed', 'raised'))
+_FOCUS_BORDER = (('focus', 3), ('!focus', 2))
+_BLACK_FOREGROUND = (('active', 'black'), ('pressed', 'black'), ('focus', 'black'))
+
+# Button style for each create_action_buttons action type
+_ACTION_STYLES = {
+    'primary': 'Accent.TButton',
+    'success': 'Success.TButton',
+    'warning': 'Warning.TButton',
+    'danger': 'Danger.TButton'
+}
 
 class ModernUI:
     """Modern UI enhancements for ShareProfitTracker"""
     
     # Enhanced Color scheme with modern gradients
-    COLORS = {
+    COLORS = MappingProxyType({
         'primary': '#2E3440',      # Dark blue-gray
         'primary_light': '#434C5E', # Lighter primary
         'primary_dark': '#242932',  # Darker primary
@@ -32,20 +65,20 @@ class ModernUI:
         'border': '#D8DEE9',       # Light border
         'border_focus': '#88C0D0', # Focus border
         'shadow': 'gray75'         # Shadow color
-    }
+    })
     
     # Typography
-    FONTS = {
+    FONTS = MappingProxyType({
         'heading': ('Segoe UI', 14, 'bold'),
         'subheading': ('Segoe UI', 12, 'bold'),
         'body': ('Segoe UI', 10),
         'body_bold': ('Segoe UI', 10, 'bold'),
         'small': ('Segoe UI', 9),
         'caption': ('Segoe UI', 8)
-    }
+    })
     
     # Unicode icons (work without external files)
-    ICONS = {
+    ICONS = MappingProxyType({
         'add': '➕',
         'edit': '✏️',
         'delete': '🗑️',
@@ -70,208 +103,68 @@ class ModernUI:
         'menu': '☰',
         'close': '✖️',
         'help': '❓'
-    }
+    })
+    
+    # Read-only tables; the fonts used by every style definition are hoisted
+    _FONT_BODY = FONTS['body']
+    _FONT_BODY_BOLD = FONTS['body_bold']
+    
+    # (icon, color) for metric changes; anything not positive shows as a drop
+    _NEGATIVE_CHANGE = (ICONS['down_arrow'], COLORS['danger'])
+    _CHANGE_PRESENTATION = MappingProxyType({
+        'positive': (ICONS['up_arrow'], COLORS['success']),
+        'negative': _NEGATIVE_CHANGE
+    })
+    
+    # Toolbar buttons: (text, icon, style)
+    _TOOLBAR_LEFT_SPEC = (
+        ('Add Stock', 'add', 'Success.TButton'),          # Green for positive action
+        ('Refresh Prices', 'refresh', 'Accent.TButton'),  # Blue accent for main action
+        ('Export Report', 'export', 'Modern.TButton')     # Standard for utility
+    )
+    
+    # Styles live in the Tk interpreter, so one configuration serves a root
+    _style = None
+    _styled_root = None
+    _treeview_styled_root = None
+    _screen_size = None  # (width, height); constant for the session
     
     @classmethod
     def configure_style(cls, root):
         """Configure modern ttk styles with advanced visual effects"""
-        style = ttk.Style()
-        
-        # Configure highly visible button styles
-        style.configure(
-            'Modern.TButton',
-            padding=(12, 8),
-            font=cls.FONTS['body_bold'],
-            focuscolor='none',
-            relief='raised',
-            background='lightgray',
-            foreground='black',
-            borderwidth=2,
-            lightcolor='white',
-            darkcolor='gray'
-        )
-        
-        # Hover and press states for Modern.TButton
-        style.map('Modern.TButton',
-            background=[
-                ('active', 'silver'),
-                ('pressed', 'darkgray'),
-                ('focus', 'lightblue')
-            ],
-            relief=[
-                ('pressed', 'sunken'),
-                ('!pressed', 'raised')
-            ],
-            borderwidth=[
-                ('focus', 3),
-                ('!focus', 2)
-            ]
-        )
-        
-        style.configure(
-            'Accent.TButton',
-            padding=(12, 8),
-            font=cls.FONTS['body_bold'],
-            focuscolor='none',
-            relief='raised',
-            background='lightblue',
-            foreground='black',
-            borderwidth=2,
-            lightcolor='white',
-            darkcolor='steelblue'
-        )
-        
-        # Hover and press states for Accent.TButton
-        style.map('Accent.TButton',
-            background=[
-                ('active', 'skyblue'),
-                ('pressed', 'steelblue'),
-                ('focus', 'dodgerblue')
-            ],
-            foreground=[
-                ('active', 'black'),
-                ('pressed', 'black'),
-                ('focus', 'black')
-            ],
-            relief=[
-                ('pressed', 'sunken'),
-                ('!pressed', 'raised')
-            ],
-            borderwidth=[
-                ('focus', 3),
-                ('!focus', 2)
-            ]
-        )
-        
-        style.configure(
-            'Success.TButton',
-            padding=(12, 8),
-            font=cls.FONTS['body_bold'],
-            focuscolor='none',
-            relief='raised',
-            background='lightgreen',
-            foreground='black',
-            borderwidth=2,
-            lightcolor='white',
-            darkcolor='darkgreen'
-        )
-        
-        # Hover and press states for Success.TButton
-        style.map('Success.TButton',
-            background=[
-                ('active', 'palegreen'),
-                ('pressed', 'darkgreen'),
-                ('focus', 'limegreen')
-            ],
-            foreground=[
-                ('active', 'black'),
-                ('pressed', 'black'),
-                ('focus', 'black')
-            ],
-            relief=[
-                ('pressed', 'sunken'),
-                ('!pressed', 'raised')
-            ],
-            borderwidth=[
-                ('focus', 3),
-                ('!focus', 2)
-            ]
-        )
-        
-        style.configure(
-            'Warning.TButton',
-            padding=(12, 8),
-            font=cls.FONTS['body_bold'],
-            focuscolor='none',
-            relief='raised',
-            background='orange',
-            foreground='black',
-            borderwidth=2,
-            lightcolor='yellow',
-            darkcolor='darkorange'
-        )
-        
-        # Hover and press states for Warning.TButton
-        style.map('Warning.TButton',
-            background=[
-                ('active', 'yellow'),
-                ('pressed', 'darkorange'),
-                ('focus', 'gold')
-            ],
-            relief=[
-                ('pressed', 'sunken'),
-                ('!pressed', 'raised')
-            ],
-            borderwidth=[
-                ('focus', 3),
-                ('!focus', 2)
-            ]
-        )
-        
-        style.configure(
-            'Danger.TButton',
-            padding=(12, 8),
-            font=cls.FONTS['body_bold'],
-            focuscolor='none',
-            relief='raised',
-            background='lightcoral',
-            foreground='black',
-            borderwidth=2,
-            lightcolor='white',
-            darkcolor='darkred'
-        )
-        
-        # Hover and press states for Danger.TButton
-        style.map('Danger.TButton',
-            background=[
-                ('active', 'mistyrose'),
-                ('pressed', 'darkred'),
-                ('focus', 'red')
-            ],
-            foreground=[
-                ('active', 'black'),
-                ('pressed', 'black'),
-                ('focus', 'black')
-            ],
-            relief=[
-                ('pressed', 'sunken'),
-                ('!pressed', 'raised')
-            ],
-            borderwidth=[
-                ('focus', 3),
-                ('!focus', 2)
-            ]
-        )
-        
-        style.configure(
-            'Icon.TButton',
-            padding=(8, 6),
-            font=cls.FONTS['body'],
-            focuscolor='none',
-            relief='raised',
-            background='lightsteelblue',
-            foreground='black',
-            borderwidth=2,
-            lightcolor='white',
-            darkcolor='steelblue'
-        )
-        
-        # Hover and press states for Icon.TButton
-        style.map('Icon.TButton',
-            background=[
-                ('active', 'lightblue'),
-                ('pressed', 'steelblue'),
-                ('focus', 'skyblue')
-            ],
-            relief=[
-                ('pressed', 'sunken'),
-                ('!pressed', 'raised')
-            ],
-            borderwidth=[
-                ('focus', 3),
-                ('!focus', 2)
-            ]
-        )
+        if cls._style is not None and cls._styled_root is root:
+            return cls._style
+        style = ttk.Style(root)
+        
+        # Configure highly visible button styles; each differs only in colors
+        for (name, padding, font_key, background, lightcolor, darkcolor,
+             active, pressed, focus, pin_foreground) in _BUTTON_STYLE_SPECS:
+            style.configure(
+                name,
+                padding=padding,
+                font=cls.FONTS[font_key],
+                focuscolor='none',
+                relief='raised',
+                background=background,
+                foreground='black',
+                borderwidth=2,
+                lightcolor=lightcolor,
+                darkcolor=darkcolor
+            )
+            
+            # Hover and press states
+            state_maps = {
+                'background': [
+                    ('active', active),
+                    ('pressed', pressed),
+                    ('focus', focus)
+                ],
+                'relief': _PRESSED_RELIEF,
+                'borderwidth': _FOCUS_BORDER
+            }
+            if pin_foreground:
+                state_maps['foreground'] = _BLACK_FOREGROUND
+            style.map(name, **state_maps)
         
         # Configure frame styles
         style.configure(
@@ -298,13 +191,13 @@ class ModernUI:
         
         style.configure(
             'Success.TLabel',
-            font=cls.FONTS['body_bold'],
+            font=cls._FONT_BODY_BOLD,
             foreground=cls.COLORS['success']
         )
         
         style.configure(
             'Danger.TLabel',
-            font=cls.FONTS['body_bold'],
+            font=cls._FONT_BODY_BOLD,
             foreground=cls.COLORS['danger']
         )
         
@@ -314,17 +207,31 @@ class ModernUI:
             anchor='center'
         )
         
+        cls._style = style
+        cls._styled_root = root
         return style
     
+    @classmethod
+    def screen_size(cls, window):
+        """Screen dimensions, read from Tk on first use"""
+        if cls._screen_size is None:
+            cls._screen_size = (window.winfo_screenwidth(), window.winfo_screenheight())
+        return cls._screen_size
+    
+    @classmethod
+    def center_dialog(cls, dialog, width, height):
+        """Give a dialog a fixed size and center it on screen"""
+        screen_width, screen_height = cls.screen_size(dialog)
+        x = (screen_width // 2) - (width // 2)
+        y = (screen_height // 2) - (height // 2)
+        dialog.geometry(f"{width}x{height}+{x}+{y}")
+    
     @classmethod
     def create_icon_button(cls, parent, text, icon_key, command=None, style='Modern.TButton'):
         """Create a button with icon and text"""
-        icon = cls.ICONS.get(icon_key, '')
-        button_text = f"{icon} {text}" if icon else text
-        
         button = ttk.Button(
             parent,
-            text=button_text,
+            text=_button_label(icon_key, text),
             command=command,
             style=style
         )
@@ -332,7 +239,7 @@ class ModernUI:
     
     @classmethod
     def create_metric_card(cls, parent, title, value, change=None, change_type=None):
-        """Create a metric card for dashboard"""
+        """Create a metric card for dashboard; returns a MetricCard holding its labels"""
         card_frame = ttk.Frame(parent, style='Card.TFrame', padding=15)
         
         # Title
@@ -352,9 +259,9 @@ class ModernUI:
         value_label.pack(pady=(5, 0))
         
         # Change indicator
+        change_label = None
         if change is not None:
-            icon = cls.ICONS['up_arrow'] if change_type == 'positive' else cls.ICONS['down_arrow']
-            color = cls.COLORS['success'] if change_type == 'positive' else cls.COLORS['danger']
+            icon, color = cls.change_presentation(change_type)
             
             change_label = ttk.Label(
                 card_frame,
@@ -364,7 +271,12 @@ class ModernUI:
             )
             change_label.pack()
         
-        return card_frame
+        return MetricCard(card_frame, value_label, change_label)
+    
+    @classmethod
+    def change_presentation(cls, change_type):
+        """Arrow icon and color for a metric change"""
+        return cls._CHANGE_PRESENTATION.get(change_type, cls._NEGATIVE_CHANGE)
     
     @classmethod
     def create_modern_toolbar(cls, parent):
@@ -375,14 +287,7 @@ class ModernUI:
         left_frame = ttk.Frame(toolbar_frame)
         left_frame.pack(side='left', fill='x', expand=True)
         
-        # Enhanced button configuration with new styles
-        buttons = [
-            ('Add Stock', 'add', 'Success.TButton'),      # Green for positive action
-            ('Refresh Prices', 'refresh', 'Accent.TButton'), # Blue accent for main action
-            ('Export Report', 'export', 'Modern.TButton')    # Standard for utility
-        ]
-        
-        for text, icon, style in buttons:
+        for text, icon, style in cls._TOOLBAR_LEFT_SPEC:
             btn = cls.create_icon_button(left_frame, text, icon, style=style)
             btn.pack(side='left', padx=(0, 15))  # Increased spacing
         
@@ -402,16 +307,7 @@ class ModernUI:
         
         for action_text, icon_key, action_type, command in actions:
             # Choose style based on action type
-            if action_type == 'primary':
-                style = 'Accent.TButton'
-            elif action_type == 'success':
-                style = 'Success.TButton'
-            elif action_type == 'warning':
-                style = 'Warning.TButton'
-            elif action_type == 'danger':
-                style = 'Danger.TButton'
-            else:
-                style = 'Modern.TButton'
+            style = _ACTION_STYLES.get(action_type, 'Modern.TButton')
             
             btn = cls.create_icon_button(
                 button_frame, 
@@ -446,25 +342,51 @@ class ModernUI:
     @classmethod
     def apply_treeview_styling(cls, treeview):
         """Apply modern styling to treeview"""
-        style = ttk.Style()
-        
-        # Configure treeview
-        style.configure(
-            'Modern.Treeview',
-            font=cls.FONTS['body'],
-            rowheight=25
-        )
-        
-        style.configure(
-            'Modern.Treeview.Heading',
-            font=cls.FONTS['body_bold'],
-            padding=(5, 5)
-        )
+        root = treeview._root()
+        if cls._treeview_styled_root is not root:
+            style = ttk.Style(root)
+            
+            # Configure treeview
+            style.configure(
+                'Modern.Treeview',
+                font=cls._FONT_BODY,
+                rowheight=25
+            )
+            
+            style.configure(
+                'Modern.Treeview.Heading',
+                font=cls._FONT_BODY_BOLD,
+                padding=(5, 5)
+            )
+            cls._treeview_styled_root = root
         
         treeview.configure(style='Modern.Treeview')
         
         return treeview
 
+@dataclass
+class MetricCard:
+    """Widgets of a dashboard metric card, kept so refreshes only change text"""
+    frame: ttk.Frame
+    value_label: ttk.Label
+    change_label: Optional[ttk.Label] = None
+    
+    def update(self, value, change=None, change_type=None):
+        """Show new figures in the existing labels"""
+        self.value_label.configure(text=value)
+        if change is not None and self.change_label is not None:
+            icon, color = ModernUI.change_presentation(change_type)
+            self.change_label.configure(text=f"{icon} {change}", foreground=color)
+
+# Shared by every empty-portfolio refresh, so it must stay read-only
+_EMPTY_METRICS = MappingProxyType({
+    'total_investment': 0.0,
+    'current_value': 0.0,
+    'total_gain_loss': 0.0,
+    'total_gain_loss_pct': 0.0,
+    'total_stocks': 0
+})
+
 class MetricCalculator:
     """Calculate metrics for dashboard"""
     
@@ -472,16 +394,16 @@ class MetricCalculator:
     def calculate_portfolio_metrics(stocks):
         """Calculate portfolio summary metrics"""
         if not stocks:
-            return {
-                'total_investment': 0.0,
-                'current_value': 0.0,
-                'total_gain_loss': 0.0,
-                'total_gain_loss_pct': 0.0,
-                'total_stocks': 0
-            }
-        
-        total_investment = sum(stock.total_investment for stock in stocks)
-        current_value = sum(stock.current_value for stock in stocks)
+            return _EMPTY_METRICS
+        
+        # Single pass over the raw fields; unpriced holdings add no current value
+        total_investment = 0.0
+        current_value = 0.0
+        for stock in stocks:
+            quantity = stock.quantity
+            total_investment += quantity * stock.purchase_price
+            if stock.current_price is not None:
+                current_value += quantity * stock.current_price
         total_gain_loss = current_value - total_investment
         total_gain_loss_pct = (total_gain_loss / total_investment * 100) if total_investment > 0 else 0.0
         
@@ -493,18 +415,47 @@ class MetricCalculator:
             'total_stocks': len(stocks)
         }
     
+    @staticmethod
+    def metrics_from_summary(summary):
+        """Build the dashboard metrics from an already computed PortfolioSummary"""
+        return {
+            'total_investment': summary.total_investment,
+            'current_value': summary.current_value,
+            'total_gain_loss': summary.total_profit_loss,
+            'total_gain_loss_pct': summary.total_profit_loss_percentage,
+            'total_stocks': summary.total_stocks
+        }
+    
     @staticmethod
     def format_currency(amount):
         """Format currency with proper symbol"""
-        if amount >= 0:
-            return f"₹{amount:,.2f}"
-        else:
-            return f"-₹{abs(amount):,.2f}"
+        if amount != amount:  # NaN never matches a cache entry
+            return _format_currency.__wrapped__(amount)
+        # Adding 0.0 folds -0.0 into 0.0; the two share a cache key
+        return _format_currency(amount + 0.0)
     
     @staticmethod
     def format_percentage(pct):
         """Format percentage with proper sign"""
-        if pct >= 0:
-            return f"+{pct:.2f}%"
-        else:
-            return f"{pct:.2f}%"
\ No newline at end of file
+        if pct != pct:
+            return _format_percentage.__wrapped__(pct)
+        return _format_percentage(pct + 0.0)
+
+
+# Toolbars and dialogs ask for the same few labels on every open
+@lru_cache(maxsize=256)
+def _button_label(icon_key, text):
+    icon = ModernUI.ICONS.get(icon_key, '')
+    return f"{icon} {text}" if icon else text
+
+
+# Dashboard redraws format the same totals again and again
+@lru_cache(maxsize=4096)
+def _format_currency(amount):
+    sign = '' if amount >= 0 else '-'
+    return f"{sign}₹{abs(amount):,.2f}"
+
+
+@lru_cache(maxsize=4096)
+def _format_percentage(pct):
+    return f"{'+' if pct >= 0 else ''}{pct:.2f}%"
\ No newline at end of file
@@ -4,19 +4,35 @@ Notifications Panel - Display notifications within the notifications tab
 
 import tkinter as tk
 from tkinter import ttk
+import tkinter.font as tkfont
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List
-import threading
+from typing import TYPE_CHECKING, List, NamedTuple, Optional
+import logging
+import time
 import sys
 import os
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.corporate_actions_fetcher import CorporateAction, corporate_actions_fetcher
-from services.enhanced_corporate_actions import EnhancedCorporateActionsFetcher, enhanced_corporate_actions_fetcher
-from services.realtime_corporate_actions import RealtimeCorporateActionsFetcher, realtime_fetcher
-from services.comprehensive_nse_bse_fetcher import ComprehensiveNSEBSEFetcher, comprehensive_fetcher
+# The fetcher modules pull in requests/yfinance, so they are imported on the
+# refresh worker the first time notifications are fetched
+if TYPE_CHECKING:
+    from services.corporate_actions_fetcher import CorporateAction
+
+logger = logging.getLogger(__name__)
+
+# Fetched actions are reused for the same symbol set until they are this old
+ACTIONS_CACHE_TTL = 15 * 60  # seconds
+
+
+class PortfolioInfo(NamedTuple):
+    """Holding details shown next to a corporate action"""
+    quantity: float
+    current_price: Optional[float]
+    current_value: float
+    company_name: str
 
 
 class NotificationsPanel:
@@ -25,11 +41,28 @@ class NotificationsPanel:
     def __init__(self, parent_frame, stocks: List = None):
         self.parent_frame = parent_frame
         self.stocks = stocks or []
-        self.actions_data: List[CorporateAction] = []
+        self.actions_data: List["CorporateAction"] = []
         self.stock_holdings = {}  # Dictionary to store stock quantities and values
+        self._portfolio_symbols = ()  # Symbols handed to the fetchers, with .NS variants
+        self._index_stocks(self.stocks)
+        self._actions_cache = {}  # symbols tuple -> (monotonic fetch time, wall-clock fetch time, actions)
+        # The fallback fetchers run side by side once the primary comes back empty
+        self._fallback_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="NotificationsFallback")
+        # One long-lived worker for refreshes; requests made while one is running
+        # are folded into a single follow-up refresh
+        self._refresh_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="NotificationsRefresh")
+        self._pending_refresh = None  # Future of the refresh in flight
+        self._queued_force = None  # force flag of the follow-up refresh, if any
+        self._last_signature = None  # signature of what the text widget shows
+        self._refresh_epoch = 0  # bumped per refresh request; older results are dropped
+        self.parent_frame.bind("<Destroy>", self._on_destroy, add="+")
+        # Tab switches map the frame; restoring an iconified window maps only the toplevel
+        self.parent_frame.bind("<Map>", self._on_map, add="+")
+        self._toplevel = self.parent_frame.winfo_toplevel()
+        self._toplevel.bind("<Map>", self._on_map, add="+")
 
         self.setup_ui()
-        print(f"DEBUG: Created notifications panel for {len(self.stocks)} stocks")
+        logger.debug("Created notifications panel for %s stocks", len(self.stocks))
 
         # Auto-refresh on startup
         self.refresh_notifications()
@@ -48,7 +81,7 @@ class NotificationsPanel:
         
         # Refresh button
         self.refresh_btn = ttk.Button(title_frame, text="🔄 Refresh Notifications",
-                                     command=self.refresh_notifications)
+                                     command=lambda: self.refresh_notifications(force=True))
         self.refresh_btn.grid(row=0, column=1, padx=(20, 0))
 
         # Auto-refresh button
@@ -57,6 +90,7 @@ class NotificationsPanel:
         self.auto_refresh_btn.grid(row=0, column=2, padx=(10, 0))
         self.auto_refresh_active = False
         self.auto_refresh_job = None
+        self._auto_refresh_missed = False  # a tick was skipped while the panel was hidden
         
         # Status label
         self.status_label = ttk.Label(title_frame, text="Loading...",
@@ -87,11 +121,19 @@ class NotificationsPanel:
         self.text_frame.grid_rowconfigure(0, weight=1)
         self.text_frame.grid_columnconfigure(0, weight=1)
         
+        # Shared font objects, resolved once instead of per tag and per redraw.
+        # Kept on the panel so Tk does not drop them while the widget is alive
+        self._font_body = tkfont.Font(family="Arial", size=11)
+        self._font_header = tkfont.Font(family="Arial", size=12, weight="bold")
+        self._font_bold11 = tkfont.Font(family="Arial", size=11, weight="bold")
+        self._font_bold10 = tkfont.Font(family="Arial", size=10, weight="bold")
+        self._font_norm10 = tkfont.Font(family="Arial", size=10)
+        
         # Text widget with scrollbar
         self.text_widget = tk.Text(
             self.text_frame,
             wrap=tk.WORD,
-            font=("Arial", 11),
+            font=self._font_body,
             bg="white",
             fg="black",
             relief="solid",
@@ -108,22 +150,28 @@ class NotificationsPanel:
         scrollbar.grid(row=0, column=1, sticky="ns")
         
         # Configure text tags for styling
-        self.text_widget.tag_configure("header", font=("Arial", 12, "bold"), 
+        self.text_widget.tag_configure("header", font=self._font_header, 
                                       foreground="darkblue")
         self.text_widget.tag_configure("dividend", foreground="green", 
-                                      font=("Arial", 11, "bold"))
+                                      font=self._font_bold11)
         self.text_widget.tag_configure("split", foreground="orange", 
-                                      font=("Arial", 11, "bold"))
+                                      font=self._font_bold11)
         self.text_widget.tag_configure("bonus", foreground="purple", 
-                                      font=("Arial", 11, "bold"))
+                                      font=self._font_bold11)
         self.text_widget.tag_configure("date", foreground="red", 
-                                      font=("Arial", 10, "bold"))
+                                      font=self._font_bold10)
         self.text_widget.tag_configure("description", foreground="black", 
-                                      font=("Arial", 10))
+                                      font=self._font_norm10)
     
-    def refresh_notifications(self):
-        """Refresh notifications"""
-        print(f"DEBUG: Starting notifications refresh...")
+    def refresh_notifications(self, force: bool = False):
+        """Refresh notifications; force skips the cached actions and refetches"""
+        # A newer request supersedes whatever is still being fetched
+        self._refresh_epoch += 1
+        epoch = self._refresh_epoch
+        if self._pending_refresh is not None and not self._pending_refresh.done():
+            self._queued_force = bool(self._queued_force) or force
+            return
+        logger.debug("Starting notifications refresh...")
         
         # Update status
         self.status_label.config(text="🔄 Refreshing...", foreground="orange")
@@ -132,265 +180,379 @@ class NotificationsPanel:
         
         def fetch_notifications():
             try:
-                print(f"DEBUG: Fetching for {len(self.stocks)} stocks...")
+                logger.debug("Fetching for %s stocks...", len(self.stocks))
                 
                 if not self.stocks:
-                    print(f"DEBUG: No stocks, showing empty")
-                    self.update_display([])
+                    logger.debug("No stocks, showing empty")
+                    self.update_display([], epoch)
                     return
                 
-                # Get portfolio symbols
-                portfolio_symbols = []
-                for stock in self.stocks:
-                    portfolio_symbols.append(stock.symbol)
-                    if not stock.symbol.endswith('.NS'):
-                        portfolio_symbols.append(f"{stock.symbol}.NS")
+                # Portfolio symbols are worked out when the stocks change
+                portfolio_symbols = self._portfolio_symbols
                 
-                print(f"DEBUG: Portfolio symbols: {portfolio_symbols[:5]}...")
+                logger.debug("Portfolio symbols: %s...", portfolio_symbols[:5])
                 
-                # Try comprehensive NSE/BSE fetcher first (most complete coverage)
-                print(f"DEBUG: Using comprehensive NSE/BSE fetcher for maximum coverage...")
-                actions = comprehensive_fetcher.get_comprehensive_corporate_actions(portfolio_symbols)
+                cache_key = portfolio_symbols
+                cached = self._actions_cache.get(cache_key)
+                if not force and cached and time.monotonic() - cached[0] < ACTIONS_CACHE_TTL:
+                    logger.debug("Using %s cached actions", len(cached[2]))
+                    self.update_display(cached[2], epoch, fetched_at=cached[1])
+                    return
                 
-                # Fallback to real-time fetcher
-                if not actions:
-                    print(f"DEBUG: Comprehensive fetcher returned no results, trying real-time...")
-                    actions = realtime_fetcher.get_comprehensive_actions(portfolio_symbols)
+                from services.comprehensive_nse_bse_fetcher import comprehensive_fetcher
+                from services.realtime_corporate_actions import realtime_fetcher
+                from services.enhanced_corporate_actions import enhanced_corporate_actions_fetcher
+                from services.corporate_actions_fetcher import corporate_actions_fetcher
                 
-                # Fallback to enhanced fetcher
-                if not actions:
-                    print(f"DEBUG: Real-time fetcher returned no results, trying enhanced...")
-                    actions = enhanced_corporate_actions_fetcher.get_portfolio_corporate_actions(
-                        portfolio_symbols, days_ahead=90
-                    )
+                fetched_at = datetime.now()
+                # Try comprehensive NSE/BSE fetcher first (most complete coverage)
+                logger.debug("Using comprehensive NSE/BSE fetcher for maximum coverage...")
+                actions = comprehensive_fetcher.get_comprehensive_corporate_actions(portfolio_symbols)
                 
-                # Final fallback to original fetcher
+                # Fallbacks in preference order: real-time, enhanced, original.
+                # All three start together; the first non-empty one in that
+                # order wins, so a slow source only delays things if it is needed
+                if not actions and epoch != self._refresh_epoch:
+                    logger.debug("Refresh superseded, skipping fallbacks")
+                    return
                 if not actions:
-                    print(f"DEBUG: Enhanced fetcher returned no results, trying original...")
-                    actions = corporate_actions_fetcher.get_portfolio_corporate_actions(
-                        portfolio_symbols, days_ahead=60
-                    )
+                    logger.debug("Comprehensive fetcher returned no results, trying fallbacks...")
+                    fallbacks = [
+                        self._fallback_pool.submit(realtime_fetcher.get_comprehensive_actions,
+                                                   portfolio_symbols),
+                        self._fallback_pool.submit(enhanced_corporate_actions_fetcher.get_portfolio_corporate_actions,
+                                                   portfolio_symbols, days_ahead=90),
+                        self._fallback_pool.submit(corporate_actions_fetcher.get_portfolio_corporate_actions,
+                                                   portfolio_symbols, days_ahead=60),
+                    ]
+                    for future in fallbacks:
+                        actions = future.result()
+                        if actions:
+                            break
+                    for future in fallbacks:
+                        future.cancel()
                 
-                print(f"DEBUG: Found {len(actions)} actions for display...")
-                self.update_display(actions)
+                logger.debug("Found %s actions for display...", len(actions))
+                if actions:
+                    # Empty results may be a fetch failure, so only real hits are kept
+                    self._actions_cache = {cache_key: (time.monotonic(), fetched_at, actions)}
+                self.update_display(actions, epoch, fetched_at=fetched_at)
                 
-            except Exception as e:
-                print(f"DEBUG: Error fetching notifications: {e}")
-                self.update_display([])
+            except Exception:
+                logger.exception("Error fetching notifications")
+                self.update_display([], epoch)
         
-        # Run in background thread
-        thread = threading.Thread(target=fetch_notifications, daemon=True)
-        thread.start()
+        # Run on the refresh worker
+        self._pending_refresh = self._refresh_pool.submit(fetch_notifications)
+        self._pending_refresh.add_done_callback(
+            lambda future: self.parent_frame.after(0, self._run_queued_refresh))
+    
+    def _run_queued_refresh(self):
+        """Start the refresh that was requested while the last one was running"""
+        if self._queued_force is None:
+            return
+        force, self._queued_force = self._queued_force, None
+        self.refresh_notifications(force=force)
+    
+    def _on_destroy(self, event):
+        """Stop the worker pools once the panel's frame goes away"""
+        if event.widget is self.parent_frame:
+            self._refresh_pool.shutdown(wait=False, cancel_futures=True)
+            self._fallback_pool.shutdown(wait=False, cancel_futures=True)
     
-    def update_display(self, actions: List[CorporateAction]):
-        """Update the notifications display"""
+    def _on_map(self, event):
+        """Catch up on an auto-refresh skipped while the panel was hidden"""
+        if event.widget is not self.parent_frame and event.widget is not self._toplevel:
+            return
+        if not self.parent_frame.winfo_exists() or not self.parent_frame.winfo_viewable():
+            return  # Window restored with the notifications tab still in the background
+        if self._auto_refresh_missed:
+            self._auto_refresh_missed = False
+            if self.auto_refresh_active:
+                self.refresh_notifications()
+    
+    def update_display(self, actions: List["CorporateAction"], epoch: int = None,
+                       fetched_at: datetime = None):
+        """Show actions fetched at fetched_at (default now); results of a superseded refresh epoch are dropped"""
+        if epoch is not None and epoch != self._refresh_epoch:
+            logger.debug("Dropping results of a superseded refresh")
+            return
+        
+        # The text is composed on the calling (fetch) thread; the Tk thread
+        # only swaps it into the widget with a single insert. When nothing
+        # shown has changed since the last render, only the footer is redone
+        try:
+            signature = self._display_signature(actions)
+            segments = None if signature == self._last_signature else self._build_display(actions)
+            footer = self._build_footer(actions, fetched_at or datetime.now())
+        except Exception:
+            logger.exception("Error building display")
+            signature = footer = None
+
         def update_ui():
+            if epoch is not None and epoch != self._refresh_epoch:
+                return
+            if footer is None:
+                self._show_update_error()
+                return
             try:
                 self.actions_data = actions
                 
-                # Clear existing content
-                self.text_widget.delete(1.0, tk.END)
+                if signature == self._last_signature:
+                    # Same content; keep the scroll position and refresh the timestamp
+                    self.text_widget.delete("footer_start", tk.END)
+                    self.text_widget.insert(tk.END, *footer)
+                else:
+                    # Replace the content in one edit
+                    self._last_signature = None
+                    body = segments if segments is not None else self._build_display(actions)
+                    self.text_widget.delete(1.0, tk.END)
+                    self.text_widget.insert(tk.END, *body)
+                    self.text_widget.mark_set("footer_start", "end-1c")
+                    self.text_widget.mark_gravity("footer_start", tk.LEFT)
+                    self.text_widget.insert(tk.END, *footer)
+                    self._last_signature = signature
+                    
+                    # Scroll to top
+                    self.text_widget.see(1.0)
                 
                 if not actions:
-                    self.text_widget.insert(tk.END, "No upcoming corporate actions found for your portfolio.\n\n")
-                    self.text_widget.insert(tk.END, "This could mean:\n")
-                    self.text_widget.insert(tk.END, "• No dividends, splits, or bonus shares scheduled\n")
-                    self.text_widget.insert(tk.END, "• Actions are beyond 60-day horizon\n")
-                    self.text_widget.insert(tk.END, "• Portfolio symbols may need .NS suffix\n\n")
-                    self.text_widget.insert(tk.END, f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                    
                     self.status_label.config(text="No notifications", foreground="gray")
                 else:
-                    # Header
-                    self.text_widget.insert(tk.END, f"🔔 CORPORATE ACTIONS FOUND ({len(actions)})\n\n", "header")
-
-                    # Group by type
-                    dividends = [a for a in actions if a.action_type.lower() == 'dividend']
-                    splits = [a for a in actions if 'split' in a.action_type.lower()]
-                    bonus = [a for a in actions if 'bonus' in a.action_type.lower()]
-
-                    # Show summary
-                    self.text_widget.insert(tk.END, "📊 SUMMARY\n", "header")
-                    self.text_widget.insert(tk.END, "─" * 50 + "\n")
-
-                    portfolio_actions = sum(1 for a in actions if self._get_portfolio_info(a.symbol))
-                    total_expected_dividend = 0
-
-                    for action in dividends:
-                        stock_info = self._get_portfolio_info(action.symbol)
-                        if stock_info and hasattr(action, 'dividend_amount') and action.dividend_amount:
-                            total_expected_dividend += action.dividend_amount * stock_info['quantity']
-
-                    self.text_widget.insert(tk.END, f"• Actions affecting your portfolio: {portfolio_actions}/{len(actions)}\n", "description")
-                    self.text_widget.insert(tk.END, f"• Dividends: {len(dividends)} | Splits: {len(splits)} | Bonus: {len(bonus)}\n", "description")
-                    if total_expected_dividend > 0:
-                        self.text_widget.insert(tk.END, f"• Total expected dividend income: ₹{total_expected_dividend:.2f}\n", "dividend")
-                    self.text_widget.insert(tk.END, "\n")
-                    
-                    # Display dividends
-                    if dividends:
-                        self.text_widget.insert(tk.END, "💰 DIVIDENDS\n", "dividend")
-                        self.text_widget.insert(tk.END, "─" * 50 + "\n")
-                        for action in dividends:
-                            self.text_widget.insert(tk.END, f"• {action.symbol}", "dividend")
-                            self.text_widget.insert(tk.END, f" - Ex-Date: {action.ex_date}", "date")
-
-                            # Create description from available data
-                            desc_parts = []
-                            if hasattr(action, 'company_name') and action.company_name:
-                                desc_parts.append(f"Company: {action.company_name}")
-                            if hasattr(action, 'dividend_amount') and action.dividend_amount:
-                                desc_parts.append(f"Amount: ₹{action.dividend_amount}")
-                            if hasattr(action, 'record_date') and action.record_date:
-                                desc_parts.append(f"Record Date: {action.record_date}")
-                            if hasattr(action, 'payment_date') and action.payment_date:
-                                desc_parts.append(f"Payment Date: {action.payment_date}")
-
-                            # Add portfolio-specific information
-                            stock_info = self._get_portfolio_info(action.symbol)
-                            if stock_info:
-                                desc_parts.append(f"Your Holdings: {stock_info['quantity']:.0f} shares")
-                                if hasattr(action, 'dividend_amount') and action.dividend_amount:
-                                    expected_dividend = action.dividend_amount * stock_info['quantity']
-                                    desc_parts.append(f"Expected Dividend: ₹{expected_dividend:.2f}")
-
-                            description = " | ".join(desc_parts) if desc_parts else "Dividend announcement"
-                            self.text_widget.insert(tk.END, f"\n  {description}\n\n", "description")
-                    
-                    # Display splits
-                    if splits:
-                        self.text_widget.insert(tk.END, "📊 STOCK SPLITS\n", "split")
-                        self.text_widget.insert(tk.END, "─" * 50 + "\n")
-                        for action in splits:
-                            self.text_widget.insert(tk.END, f"• {action.symbol}", "split")
-                            self.text_widget.insert(tk.END, f" - Ex-Date: {action.ex_date}", "date")
-
-                            # Create description from available data
-                            desc_parts = []
-                            if hasattr(action, 'company_name') and action.company_name:
-                                desc_parts.append(f"Company: {action.company_name}")
-                            if hasattr(action, 'ratio_from') and hasattr(action, 'ratio_to') and action.ratio_from and action.ratio_to:
-                                desc_parts.append(f"Split Ratio: {action.ratio_to}:{action.ratio_from}")
-                            if hasattr(action, 'record_date') and action.record_date:
-                                desc_parts.append(f"Record Date: {action.record_date}")
-
-                            # Add portfolio-specific information
-                            stock_info = self._get_portfolio_info(action.symbol)
-                            if stock_info:
-                                desc_parts.append(f"Your Holdings: {stock_info['quantity']:.0f} shares")
-                                if hasattr(action, 'ratio_from') and hasattr(action, 'ratio_to') and action.ratio_from and action.ratio_to:
-                                    new_shares = stock_info['quantity'] * (action.ratio_to / action.ratio_from)
-                                    additional_shares = new_shares - stock_info['quantity']
-                                    desc_parts.append(f"You'll receive: {additional_shares:.0f} additional shares")
-
-                            description = " | ".join(desc_parts) if desc_parts else "Stock split announcement"
-                            self.text_widget.insert(tk.END, f"\n  {description}\n\n", "description")
-                    
-                    # Display bonus shares
-                    if bonus:
-                        self.text_widget.insert(tk.END, "🎁 BONUS SHARES\n", "bonus")
-                        self.text_widget.insert(tk.END, "─" * 50 + "\n")
-                        for action in bonus:
-                            self.text_widget.insert(tk.END, f"• {action.symbol}", "bonus")
-                            self.text_widget.insert(tk.END, f" - Ex-Date: {action.ex_date}", "date")
-
-                            # Create description from available data
-                            desc_parts = []
-                            if hasattr(action, 'company_name') and action.company_name:
-                                desc_parts.append(f"Company: {action.company_name}")
-                            if hasattr(action, 'ratio_from') and hasattr(action, 'ratio_to') and action.ratio_from and action.ratio_to:
-                                desc_parts.append(f"Bonus Ratio: {action.ratio_to}:{action.ratio_from}")
-                            if hasattr(action, 'record_date') and action.record_date:
-                                desc_parts.append(f"Record Date: {action.record_date}")
-
-                            # Add portfolio-specific information
-                            stock_info = self._get_portfolio_info(action.symbol)
-                            if stock_info:
-                                desc_parts.append(f"Your Holdings: {stock_info['quantity']:.0f} shares")
-                                if hasattr(action, 'ratio_from') and hasattr(action, 'ratio_to') and action.ratio_from and action.ratio_to:
-                                    bonus_shares = stock_info['quantity'] * (action.ratio_to / action.ratio_from)
-                                    desc_parts.append(f"Bonus Shares: {bonus_shares:.0f} additional shares")
-
-                            description = " | ".join(desc_parts) if desc_parts else "Bonus shares announcement"
-                            self.text_widget.insert(tk.END, f"\n  {description}\n\n", "description")
-                    
-                    # Footer
-                    self.text_widget.insert(tk.END, "─" * 70 + "\n")
-                    self.text_widget.insert(tk.END, f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    self.text_widget.insert(tk.END, "💡 Tip: Click 'Refresh Notifications' to update")
-                    
                     self.status_label.config(text=f"{len(actions)} notifications", foreground="green")
                 
-                # Scroll to top
-                self.text_widget.see(1.0)
-                
                 # Re-enable refresh button
                 self.refresh_btn.config(state="normal")
                 self.refresh_btn.config(text="🔄 Refresh Notifications")
                 
-                print(f"DEBUG: Updated display with {len(actions)} actions")
+                logger.debug("Updated display with %s actions", len(actions))
                 
-            except Exception as e:
-                print(f"DEBUG: Error updating display: {e}")
-                self.status_label.config(text="❌ Error updating", foreground="red")
-                self.refresh_btn.config(state="normal")
-                self.refresh_btn.config(text="🔄 Refresh Notifications")
+            except Exception:
+                logger.exception("Error updating display")
+                self._show_update_error()
         
         # Update UI from main thread
         self.parent_frame.after(0, update_ui)
     
+    def _show_update_error(self):
+        """Flag a failed redraw and let the user try again"""
+        self.status_label.config(text="❌ Error updating", foreground="red")
+        self.refresh_btn.config(state="normal")
+        self.refresh_btn.config(text="🔄 Refresh Notifications")
+    
+    def _display_signature(self, actions: List["CorporateAction"]) -> tuple:
+        """Everything the rendered text depends on, apart from the timestamp"""
+        return (
+            tuple((action.symbol, action.action_type, action.ex_date,
+                   getattr(action, 'company_name', None), getattr(action, 'dividend_amount', None),
+                   getattr(action, 'record_date', None), getattr(action, 'payment_date', None),
+                   getattr(action, 'ratio_from', None), getattr(action, 'ratio_to', None))
+                  for action in actions),
+            tuple((symbol, stock.quantity) for symbol, stock in self.stock_holdings.items()),
+        )
+    
+    def _build_footer(self, actions: List["CorporateAction"], fetched_at: datetime) -> list:
+        """Compose the "Last updated" footer from the time the shown actions were fetched"""
+        timestamp = f"Last updated: {fetched_at.strftime('%Y-%m-%d %H:%M:%S')}"
+        if not actions:
+            return [timestamp, ()]
+        return [timestamp + "\n", (), "💡 Tip: Click 'Refresh Notifications' to update", ()]
+    
+    def _build_display(self, actions: List["CorporateAction"]) -> list:
+        """Compose the notifications text, less the footer, as Text.insert arguments: text, tags, ..."""
+        segments = []
+
+        def emit(text, tag=()):
+            segments.append(text)
+            segments.append(tag)
+
+        if not actions:
+            emit("No upcoming corporate actions found for your portfolio.\n\n")
+            emit("This could mean:\n")
+            emit("• No dividends, splits, or bonus shares scheduled\n")
+            emit("• Actions are beyond 60-day horizon\n")
+            emit("• Portfolio symbols may need .NS suffix\n\n")
+            return segments
+
+        # Header
+        emit(f"🔔 CORPORATE ACTIONS FOUND ({len(actions)})\n\n", "header")
+
+        # Group by type and total the summary figures in one pass
+        dividends, splits, bonus = [], [], []
+        portfolio_actions = 0
+        total_expected_dividend = 0
+        portfolio_info = {}  # symbol -> holding info, looked up once per render
+        for action in actions:
+            action_type = action.action_type.lower()
+            if action.symbol not in portfolio_info:
+                portfolio_info[action.symbol] = self._get_portfolio_info(action.symbol)
+            stock_info = portfolio_info[action.symbol]
+            if stock_info:
+                portfolio_actions += 1
+            if action_type == 'dividend':
+                dividends.append(action)
+                dividend_amount = getattr(action, 'dividend_amount', None)
+                if stock_info and dividend_amount:
+                    total_expected_dividend += dividend_amount * stock_info.quantity
+            # A type can mention both, e.g. "Split / Bonus"
+            if 'split' in action_type:
+                splits.append(action)
+            if 'bonus' in action_type:
+                bonus.append(action)
+
+        # Show summary
+        emit("📊 SUMMARY\n", "header")
+        emit("─" * 50 + "\n")
+        emit(f"• Actions affecting your portfolio: {portfolio_actions}/{len(actions)}\n", "description")
+        emit(f"• Dividends: {len(dividends)} | Splits: {len(splits)} | Bonus: {len(bonus)}\n", "description")
+        if total_expected_dividend > 0:
+            emit(f"• Total expected dividend income: ₹{total_expected_dividend:.2f}\n", "dividend")
+        emit("\n")
+        
+        # Display dividends
+        if dividends:
+            emit("💰 DIVIDENDS\n", "dividend")
+            emit("─" * 50 + "\n")
+            for action in dividends:
+                emit(f"• {action.symbol}", "dividend")
+                emit(f" - Ex-Date: {action.ex_date}", "date")
+
+                # Create description from available data
+                desc_parts = []
+                company_name = getattr(action, 'company_name', None)
+                if company_name:
+                    desc_parts.append(f"Company: {company_name}")
+                dividend_amount = getattr(action, 'dividend_amount', None)
+                if dividend_amount:
+                    desc_parts.append(f"Amount: ₹{dividend_amount}")
+                record_date = getattr(action, 'record_date', None)
+                if record_date:
+                    desc_parts.append(f"Record Date: {record_date}")
+                payment_date = getattr(action, 'payment_date', None)
+                if payment_date:
+                    desc_parts.append(f"Payment Date: {payment_date}")
+
+                # Add portfolio-specific information
+                stock_info = portfolio_info[action.symbol]
+                if stock_info:
+                    desc_parts.append(f"Your Holdings: {stock_info.quantity:.0f} shares")
+                    if dividend_amount:
+                        expected_dividend = dividend_amount * stock_info.quantity
+                        desc_parts.append(f"Expected Dividend: ₹{expected_dividend:.2f}")
+
+                description = " | ".join(desc_parts) if desc_parts else "Dividend announcement"
+                emit(f"\n  {description}\n\n", "description")
+        
+        # Display splits
+        if splits:
+            emit("📊 STOCK SPLITS\n", "split")
+            emit("─" * 50 + "\n")
+            for action in splits:
+                emit(f"• {action.symbol}", "split")
+                emit(f" - Ex-Date: {action.ex_date}", "date")
+
+                # Create description from available data
+                desc_parts = []
+                company_name = getattr(action, 'company_name', None)
+                if company_name:
+                    desc_parts.append(f"Company: {company_name}")
+                ratio_from = getattr(action, 'ratio_from', None)
+                ratio_to = getattr(action, 'ratio_to', None)
+                if ratio_from and ratio_to:
+                    desc_parts.append(f"Split Ratio: {ratio_to}:{ratio_from}")
+                record_date = getattr(action, 'record_date', None)
+                if record_date:
+                    desc_parts.append(f"Record Date: {record_date}")
+
+                # Add portfolio-specific information
+                stock_info = portfolio_info[action.symbol]
+                if stock_info:
+                    desc_parts.append(f"Your Holdings: {stock_info.quantity:.0f} shares")
+                    if ratio_from and ratio_to:
+                        new_shares = stock_info.quantity * (ratio_to / ratio_from)
+                        additional_shares = new_shares - stock_info.quantity
+                        desc_parts.append(f"You'll receive: {additional_shares:.0f} additional shares")
+
+                description = " | ".join(desc_parts) if desc_parts else "Stock split announcement"
+                emit(f"\n  {description}\n\n", "description")
+        
+        # Display bonus shares
+        if bonus:
+            emit("🎁 BONUS SHARES\n", "bonus")
+            emit("─" * 50 + "\n")
+            for action in bonus:
+                emit(f"• {action.symbol}", "bonus")
+                emit(f" - Ex-Date: {action.ex_date}", "date")
+
+                # Create description from available data
+                desc_parts = []
+                company_name = getattr(action, 'company_name', None)
+                if company_name:
+                    desc_parts.append(f"Company: {company_name}")
+                ratio_from = getattr(action, 'ratio_from', None)
+                ratio_to = getattr(action, 'ratio_to', None)
+                if ratio_from and ratio_to:
+                    desc_parts.append(f"Bonus Ratio: {ratio_to}:{ratio_from}")
+                record_date = getattr(action, 'record_date', None)
+                if record_date:
+                    desc_parts.append(f"Record Date: {record_date}")
+
+                # Add portfolio-specific information
+                stock_info = portfolio_info[action.symbol]
+                if stock_info:
+                    desc_parts.append(f"Your Holdings: {stock_info.quantity:.0f} shares")
+                    if ratio_from and ratio_to:
+                        bonus_shares = stock_info.quantity * (ratio_to / ratio_from)
+                        desc_parts.append(f"Bonus Shares: {bonus_shares:.0f} additional shares")
+
+                description = " | ".join(desc_parts) if desc_parts else "Bonus shares announcement"
+                emit(f"\n  {description}\n\n", "description")
+        
+        # Footer
+        emit("─" * 70 + "\n")
+        return segments
+    
     def update_stocks(self, stocks: List):
         """Update the stocks list and refresh"""
         self.stocks = stocks
+        self._index_stocks(stocks)
+
+        logger.debug("Updated stocks list to %s stocks", len(stocks))
+        self.refresh_notifications()
 
+    def _index_stocks(self, stocks: List):
+        """Rebuild the holdings lookup and the symbols passed to the fetchers"""
         # Update stock holdings dictionary for quick lookups
         self.stock_holdings = {}
+        symbols = {}  # ordered set: holding both RELIANCE and RELIANCE.NS must not send it twice
         for stock in stocks:
             symbol = stock.symbol
+            symbols[symbol] = None
             # Also store with .NS suffix if not present
             if not symbol.endswith('.NS'):
                 symbol_ns = f"{symbol}.NS"
                 self.stock_holdings[symbol_ns] = stock
+                symbols[symbol_ns] = None
             self.stock_holdings[symbol] = stock
+        self._portfolio_symbols = tuple(symbols)
 
-        print(f"DEBUG: Updated stocks list to {len(stocks)} stocks")
-        self.refresh_notifications()
-
-    def _get_portfolio_info(self, symbol: str) -> dict:
+    def _get_portfolio_info(self, symbol: str) -> Optional[PortfolioInfo]:
         """Get portfolio information for a given stock symbol"""
-        # Try direct symbol match first
-        if symbol in self.stock_holdings:
-            stock = self.stock_holdings[symbol]
-            return {
-                'quantity': stock.quantity,
-                'current_price': stock.current_price,
-                'current_value': stock.current_value if hasattr(stock, 'current_value') else 0,
-                'company_name': stock.company_name
-            }
-
-        # Try symbol with .NS suffix if not found
-        symbol_ns = symbol if symbol.endswith('.NS') else f"{symbol}.NS"
-        if symbol_ns in self.stock_holdings:
-            stock = self.stock_holdings[symbol_ns]
-            return {
-                'quantity': stock.quantity,
-                'current_price': stock.current_price,
-                'current_value': stock.current_value if hasattr(stock, 'current_value') else 0,
-                'company_name': stock.company_name
-            }
-
-        # Try symbol without .NS suffix if not found
-        symbol_base = symbol.replace('.NS', '') if symbol.endswith('.NS') else symbol
-        if symbol_base in self.stock_holdings:
-            stock = self.stock_holdings[symbol_base]
-            return {
-                'quantity': stock.quantity,
-                'current_price': stock.current_price,
-                'current_value': stock.current_value if hasattr(stock, 'current_value') else 0,
-                'company_name': stock.company_name
-            }
-
-        return None
+        # Holdings are keyed by both the bare and the .NS symbol, so a direct
+        # match covers almost every case; otherwise try the other form once
+        stock = self.stock_holdings.get(symbol)
+        if stock is None:
+            alternate = symbol[:-3] if symbol.endswith('.NS') else f"{symbol}.NS"
+            stock = self.stock_holdings.get(alternate)
+            if stock is None:
+                return None
+
+        return PortfolioInfo(
+            quantity=stock.quantity,
+            current_price=stock.current_price,
+            current_value=getattr(stock, 'current_value', 0),
+            company_name=stock.company_name
+        )
 
     def toggle_auto_refresh(self):
         """Toggle auto-refresh functionality"""
@@ -401,18 +563,21 @@ class NotificationsPanel:
                 self.parent_frame.after_cancel(self.auto_refresh_job)
                 self.auto_refresh_job = None
             self.auto_refresh_btn.config(text="⏰ Auto Refresh (30s)")
-            print("DEBUG: Auto-refresh disabled")
+            logger.debug("Auto-refresh disabled")
         else:
             # Start auto-refresh
             self.auto_refresh_active = True
             self.auto_refresh_btn.config(text="⏹ Stop Auto Refresh")
             self.schedule_auto_refresh()
-            print("DEBUG: Auto-refresh enabled")
+            logger.debug("Auto-refresh enabled")
 
     def schedule_auto_refresh(self):
         """Schedule the next auto-refresh"""
         if self.auto_refresh_active:
-            # Refresh now
-            self.refresh_notifications()
+            # Refresh now, unless the tab is in the background or the window is iconified
+            if self.parent_frame.winfo_viewable():
+                self.refresh_notifications()
+            else:
+                self._auto_refresh_missed = True
             # Schedule next refresh in 30 seconds
             self.auto_refresh_job = self.parent_frame.after(30000, self.schedule_auto_refresh)
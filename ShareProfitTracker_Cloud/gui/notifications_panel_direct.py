@@ -6,9 +6,12 @@ Direct labels placed in main frame for absolute visibility.
 
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
-from typing import List
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Optional
+import logging
 import threading
+import time
 import sys
 import os
 
@@ -17,6 +20,28 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.corporate_actions_fetcher import CorporateAction, corporate_actions_fetcher
 
+logger = logging.getLogger(__name__)
+
+# Detail line per action type; None (data missing) falls back to a generic
+# announcement line
+_DETAIL_FORMATS = {
+    'dividend': lambda a: f"DIVIDEND: Rs. {a.dividend_amount} per share" if a.dividend_amount else None,
+    'split': lambda a: f"SPLIT RATIO: {a.ratio_from}:{a.ratio_to}" if a.ratio_from and a.ratio_to else None,
+    'bonus': lambda a: f"BONUS RATIO: {a.ratio_from}:{a.ratio_to}" if a.ratio_from and a.ratio_to else None,
+}
+
+# Fetched actions are reused for the same symbol set until they are this old
+ACTIONS_CACHE_TTL = 5 * 60  # seconds
+
+
+@lru_cache(maxsize=512)
+def _parse_ex_date(ex_date_str: str) -> Optional[date]:
+    """Parse an ex-date once per distinct string; None if it is not YYYY-MM-DD"""
+    try:
+        return datetime.strptime(ex_date_str, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
 
 class DirectNotificationsPanel:
     """Ultra direct notifications panel - no fancy widgets"""
@@ -26,11 +51,19 @@ class DirectNotificationsPanel:
         self.stocks = stocks or []
         self.notifications_frame = None
         self.actions_data: List[CorporateAction] = []
-        self.notification_widgets = []  # Store all notification widgets
+        # Pooled (frame, title, date, detail, warning) rows, reused across refreshes;
+        # the first _rows_shown of them are packed
+        self.notification_rows = []
+        self._rows_shown = 0
+        self._actions_cache = {}  # symbol set -> (fetched at, actions)
+        self._fetch_in_flight = False
+        self._queued_force = None  # force flag of a refresh requested mid-fetch, if any
+        self._stocks_refresh_job = None  # pending debounced refresh after update_stocks
         
-        print(f"DEBUG: Creating DIRECT notifications panel...")
+        logger.debug("Creating DIRECT notifications panel...")
         self.create_direct_panel()
-        self.refresh_notifications()
+        # First fetch once the panel's initial layout has been done
+        self.notifications_frame.after_idle(self.refresh_notifications)
     
     def create_direct_panel(self):
         """Create ultra direct panel with no complex widgets"""
@@ -82,59 +115,69 @@ class DirectNotificationsPanel:
         )
         self.refresh_button.pack(pady=10)
         
-        print(f"DEBUG: Direct panel created successfully")
+        logger.debug("Direct panel created successfully")
     
-    def refresh_notifications(self):
-        """Refresh notifications"""
-        print(f"DEBUG: Starting DIRECT notifications refresh...")
+    def refresh_notifications(self, force: bool = False):
+        """Refresh notifications; force skips the cached actions and refetches"""
+        if self._fetch_in_flight:
+            # Fold into one follow-up refresh once the running fetch lands
+            self._queued_force = bool(self._queued_force) or force
+            return
+        self._fetch_in_flight = True
+        logger.debug("Starting DIRECT notifications refresh...")
         
         def fetch_notifications():
             try:
-                print(f"DEBUG: Fetching for {len(self.stocks)} stocks...")
+                logger.debug("Fetching for %s stocks...", len(self.stocks))
                 
                 if not self.stocks:
-                    print(f"DEBUG: No stocks, showing empty")
+                    logger.debug("No stocks, showing empty")
                     self.update_direct_display([])
                     return
                 
-                # Get portfolio symbols
-                portfolio_symbols = []
+                # Get portfolio symbols; an ordered set, since holding both
+                # RELIANCE and RELIANCE.NS must not send RELIANCE.NS twice
+                symbols = {}
                 for stock in self.stocks:
-                    portfolio_symbols.append(stock.symbol)
+                    symbols[stock.symbol] = None
                     if not stock.symbol.endswith('.NS'):
-                        portfolio_symbols.append(f"{stock.symbol}.NS")
+                        symbols[f"{stock.symbol}.NS"] = None
+                portfolio_symbols = list(symbols)
                 
-                print(f"DEBUG: Portfolio symbols: {portfolio_symbols[:5]}...")
+                logger.debug("Portfolio symbols: %s...", portfolio_symbols[:5])
+                
+                cache_key = frozenset(portfolio_symbols)
+                cached = self._actions_cache.get(cache_key)
+                if not force and cached and time.monotonic() - cached[0] < ACTIONS_CACHE_TTL:
+                    logger.debug("Using %s cached actions", len(cached[1]))
+                    self.update_direct_display(cached[1])
+                    return
                 
                 # Fetch corporate actions
                 actions = corporate_actions_fetcher.get_portfolio_corporate_actions(
                     portfolio_symbols, days_ahead=60
                 )
+                if actions:
+                    # Empty results may be a fetch failure, so only real hits are kept
+                    self._actions_cache = {cache_key: (time.monotonic(), actions)}
                 
-                print(f"DEBUG: Found {len(actions)} actions for DIRECT display...")
+                logger.debug("Found %s actions for DIRECT display...", len(actions))
                 self.update_direct_display(actions)
                 
-            except Exception as e:
-                print(f"ERROR in DIRECT fetch: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Error in DIRECT fetch")
                 self.update_direct_display([])
         
         threading.Thread(target=fetch_notifications, daemon=True).start()
     
     def update_direct_display(self, actions: List[CorporateAction]):
         """Update display directly - MAIN THREAD"""
-        print(f"DEBUG: DIRECT update with {len(actions)} actions")
+        logger.debug("DIRECT update with %s actions", len(actions))
         
         def update_on_main_thread():
             try:
                 self.actions_data = actions
                 
-                # Clear existing notification widgets
-                for widget in self.notification_widgets:
-                    widget.destroy()
-                self.notification_widgets.clear()
-                
                 # Update status
                 count = len(actions)
                 if count == 0:
@@ -145,51 +188,97 @@ class DirectNotificationsPanel:
                     status_bg = "lightgreen"
                 
                 self.status_label.config(text=status_text, bg=status_bg)
-                print(f"DEBUG: Status updated: {status_text}")
+                logger.debug("Status updated: %s", status_text)
                 
-                # Create notification widgets directly
-                if actions:
-                    for i, action in enumerate(actions):
-                        self.create_direct_notification(action, i)
-                        
-                print(f"DEBUG: Created {len(self.notification_widgets)} DIRECT widgets")
+                # Fill the pooled rows, creating more only when the list grew
+                today = datetime.now().date()
+                for i, action in enumerate(actions):
+                    self.create_direct_notification(action, i, today)
                 
-                # Force refresh
-                self.notifications_frame.update()
-                self.notifications_frame.update_idletasks()
+                # Hide rows left over from a longer previous list
+                for row in self.notification_rows[len(actions):self._rows_shown]:
+                    row[0].pack_forget()
+                self._rows_shown = len(actions)
+                        
+                logger.debug("Showing %s of %s DIRECT rows", len(actions), len(self.notification_rows))
+                # No forced update() here: Tk lays out all the row changes in
+                # one geometry pass when it next goes idle
                 
-            except Exception as e:
-                print(f"ERROR in DIRECT update: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Error in DIRECT update")
+            finally:
+                self._finish_refresh()
         
         # Main thread update
         try:
             self.notifications_frame.after(0, update_on_main_thread)
-            print(f"DEBUG: Scheduled DIRECT update")
+            logger.debug("Scheduled DIRECT update")
         except Exception as e:
-            print(f"ERROR scheduling DIRECT update: {e}")
+            logger.error("Error scheduling DIRECT update: %s", e)
             update_on_main_thread()
     
-    def create_direct_notification(self, action: CorporateAction, index: int):
-        """Create notification widget directly in main frame"""
+    def create_notification_row(self):
+        """Create an unpacked notification row: (frame, title, date, detail, warning)"""
+        notification_frame = tk.Frame(
+            self.notifications_frame,
+            relief="solid",
+            borderwidth=3,
+            bg="lightyellow",
+            padx=15,
+            pady=10
+        )
+        
+        title_label = tk.Label(
+            notification_frame,
+            font=("Arial", 14, "bold"),
+            relief="solid",
+            borderwidth=2,
+            padx=10,
+            pady=5
+        )
+        title_label.pack(fill="x", pady=2)
+        
+        date_label = tk.Label(
+            notification_frame,
+            font=("Arial", 12, "bold"),
+            bg="lightyellow",
+            fg="darkblue"
+        )
+        date_label.pack(fill="x", pady=2)
+        
+        detail_label = tk.Label(
+            notification_frame,
+            font=("Arial", 11, "bold"),
+            bg="lightyellow",
+            fg="darkgreen"
+        )
+        detail_label.pack(fill="x", pady=2)
+        
+        warning_label = tk.Label(
+            notification_frame,
+            font=("Arial", 10, "bold"),
+            bg="lightyellow",
+            fg="red"
+        )
+        warning_label.pack(fill="x", pady=2)
+        
+        return notification_frame, title_label, date_label, detail_label, warning_label
+    
+    def create_direct_notification(self, action: CorporateAction, index: int, today: date = None):
+        """Show an action in the notification row at index, creating the row if needed"""
         try:
-            # Calculate days until
-            days_until = self.calculate_days_until(action.ex_date)
+            if index == len(self.notification_rows):
+                self.notification_rows.append(self.create_notification_row())
+            notification_frame, title_label, date_label, detail_label, warning_label = self.notification_rows[index]
+            if index >= self._rows_shown:
+                notification_frame.pack(fill="x", padx=5, pady=5)
             
-            # Create notification frame
-            notification_frame = tk.Frame(
-                self.notifications_frame,
-                relief="solid",
-                borderwidth=3,
-                bg="lightyellow",
-                padx=15,
-                pady=10
-            )
-            notification_frame.pack(fill="x", padx=5, pady=5)
+            # Calculate days until
+            days_until = self.calculate_days_until(action.ex_date, today)
             
             # Title
-            title_text = f"{index+1}. {action.symbol} - {action.action_type.upper()}"
+            action_type = action.action_type.upper()
+            title_text = f"{index+1}. {action.symbol} - {action_type}"
             if "TODAY" in days_until:
                 title_bg = "red"
                 title_fg = "white"
@@ -199,96 +288,64 @@ class DirectNotificationsPanel:
             else:
                 title_bg = "lightblue"
                 title_fg = "black"
-            
-            title_label = tk.Label(
-                notification_frame,
-                text=title_text,
-                font=("Arial", 14, "bold"),
-                bg=title_bg,
-                fg=title_fg,
-                relief="solid",
-                borderwidth=2,
-                padx=10,
-                pady=5
-            )
-            title_label.pack(fill="x", pady=2)
+            title_label.config(text=title_text, bg=title_bg, fg=title_fg)
             
             # Ex-date
-            date_text = f"EX-DATE: {action.ex_date} ({days_until})"
-            date_label = tk.Label(
-                notification_frame,
-                text=date_text,
-                font=("Arial", 12, "bold"),
-                bg="lightyellow",
-                fg="darkblue"
-            )
-            date_label.pack(fill="x", pady=2)
+            date_label.config(text=f"EX-DATE: {action.ex_date} ({days_until})")
             
             # Details
-            if action.action_type.lower() == 'dividend' and action.dividend_amount:
-                detail_text = f"DIVIDEND: Rs. {action.dividend_amount} per share"
-            elif action.action_type.lower() == 'split' and action.ratio_from and action.ratio_to:
-                detail_text = f"SPLIT RATIO: {action.ratio_from}:{action.ratio_to}"
-            elif action.action_type.lower() == 'bonus' and action.ratio_from and action.ratio_to:
-                detail_text = f"BONUS RATIO: {action.ratio_from}:{action.ratio_to}"
-            else:
-                detail_text = f"{action.action_type.upper()} ANNOUNCED"
-            
-            detail_label = tk.Label(
-                notification_frame,
-                text=detail_text,
-                font=("Arial", 11, "bold"),
-                bg="lightyellow",
-                fg="darkgreen"
-            )
-            detail_label.pack(fill="x", pady=2)
+            formatter = _DETAIL_FORMATS.get(action.action_type.lower())
+            detail_text = (formatter and formatter(action)) or f"{action_type} ANNOUNCED"
+            detail_label.config(text=detail_text)
             
             # Warning
-            warning_text = f"IMPORTANT: OWN SHARES BEFORE {action.ex_date} TO QUALIFY!"
-            warning_label = tk.Label(
-                notification_frame,
-                text=warning_text,
-                font=("Arial", 10, "bold"),
-                bg="lightyellow",
-                fg="red"
-            )
-            warning_label.pack(fill="x", pady=2)
+            warning_label.config(text=f"IMPORTANT: OWN SHARES BEFORE {action.ex_date} TO QUALIFY!")
             
-            # Store widget
-            self.notification_widgets.append(notification_frame)
-            
-            print(f"DEBUG: Created DIRECT widget for {action.symbol} {action.action_type}")
+            logger.debug("Showing DIRECT row for %s %s", action.symbol, action.action_type)
             
         except Exception as e:
-            print(f"ERROR creating DIRECT notification: {e}")
+            logger.error("Error creating DIRECT notification: %s", e)
     
-    def calculate_days_until(self, ex_date_str: str) -> str:
-        """Calculate days until ex-date"""
-        try:
-            ex_date = datetime.strptime(ex_date_str, '%Y-%m-%d').date()
-            today = datetime.now().date()
-            days_diff = (ex_date - today).days
-            
-            if days_diff < 0:
-                return f"{abs(days_diff)} days ago"
-            elif days_diff == 0:
-                return "TODAY!"
-            elif days_diff == 1:
-                return "Tomorrow"
-            else:
-                return f"in {days_diff} days"
-        except:
+    def calculate_days_until(self, ex_date_str: str, today: date = None) -> str:
+        """Calculate days until ex-date; callers formatting many actions pass today"""
+        ex_date = _parse_ex_date(ex_date_str)
+        if ex_date is None:
             return "date unknown"
+        days_diff = (ex_date - (today or datetime.now().date())).days
+        
+        if days_diff < 0:
+            return f"{abs(days_diff)} days ago"
+        elif days_diff == 0:
+            return "TODAY!"
+        elif days_diff == 1:
+            return "Tomorrow"
+        else:
+            return f"in {days_diff} days"
     
     def update_stocks(self, stocks: List):
         """Update stocks and refresh"""
-        print(f"DEBUG: DIRECT panel updating stocks ({len(stocks)} stocks)")
+        logger.debug("DIRECT panel updating stocks (%s stocks)", len(stocks))
         self.stocks = stocks
+        # Bulk edits call this once per stock; only the last call in a burst fetches
+        if self._stocks_refresh_job:
+            self.notifications_frame.after_cancel(self._stocks_refresh_job)
+        self._stocks_refresh_job = self.notifications_frame.after(250, self._refresh_after_stocks_update)
+    
+    def _refresh_after_stocks_update(self):
+        """Run the debounced refresh scheduled by update_stocks"""
+        self._stocks_refresh_job = None
         self.refresh_notifications()
     
+    def _finish_refresh(self):
+        """Clear the in-flight flag and start any refresh requested meanwhile"""
+        self._fetch_in_flight = False
+        if self._queued_force is not None:
+            force, self._queued_force = self._queued_force, None
+            self.refresh_notifications(force=force)
+    
     def manual_refresh(self):
         """Manual refresh"""
-        print(f"DEBUG: DIRECT manual refresh clicked")
+        logger.debug("DIRECT manual refresh clicked")
         self.refresh_button.config(state="disabled", text="REFRESHING...")
         
         def enable_button():
@@ -298,7 +355,7 @@ class DirectNotificationsPanel:
                 pass
         
         self.notifications_frame.after(3000, enable_button)
-        self.refresh_notifications()
+        self.refresh_notifications(force=True)
     
     def get_notification_count(self) -> int:
         """Get notification count"""
@@ -6,9 +6,12 @@ Uses simple labels instead of text widgets for guaranteed visibility.
 
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
-from typing import List
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Optional
+import logging
 import threading
+import time
 import sys
 import os
 
@@ -17,6 +20,33 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.corporate_actions_fetcher import CorporateAction, corporate_actions_fetcher
 
+logger = logging.getLogger(__name__)
+
+# Detail line per action type; None (data missing) falls back to a generic
+# announcement line
+_DETAIL_FORMATS = {
+    'dividend': lambda a: f"Dividend: Rs. {a.dividend_amount} per share" if a.dividend_amount else None,
+    'split': lambda a: f"Split Ratio: {a.ratio_from}:{a.ratio_to}" if a.ratio_from and a.ratio_to else None,
+    'bonus': lambda a: f"Bonus Ratio: {a.ratio_from}:{a.ratio_to}" if a.ratio_from and a.ratio_to else None,
+}
+
+# Fetched actions are reused for the same symbol set until they are this old
+ACTIONS_CACHE_TTL = 5 * 60  # seconds
+
+
+@lru_cache(maxsize=512)
+def _parse_ex_date(ex_date_str: str) -> Optional[date]:
+    """Parse an ex-date once per distinct string; None if it is not YYYY-MM-DD"""
+    try:
+        return datetime.strptime(ex_date_str, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+# Vertical space per action row in the canvas; the fallback is used until a
+# real row has been measured
+ROW_GAP = 6  # pixels
+ROW_HEIGHT_FALLBACK = 110  # pixels
+
 
 class LabelNotificationsPanel:
     """Ultra simple notifications panel using only labels"""
@@ -26,12 +56,21 @@ class LabelNotificationsPanel:
         self.stocks = stocks or []
         self.notifications_frame = None
         self.actions_data: List[CorporateAction] = []
-        self.notification_labels = []  # Store label widgets
+        # Pooled (frame, title, date, detail, warning, canvas item) rows; only
+        # enough to fill the visible part of the canvas, refilled on scroll
+        self.notification_rows = []
+        self._row_actions = []  # index of the action each pooled row currently shows
+        self._row_height = None
         self.last_refresh = None
+        self._actions_cache = {}  # symbol set -> (fetched at, actions)
+        self._fetch_in_flight = False
+        self._queued_force = None  # force flag of a refresh requested mid-fetch, if any
+        self._stocks_refresh_job = None  # pending debounced refresh after update_stocks
         
-        print(f"DEBUG: Creating LABEL-BASED notifications panel...")
+        logger.debug("Creating LABEL-BASED notifications panel...")
         self.create_label_panel()
-        self.refresh_notifications()
+        # First fetch once the panel's initial layout has been done
+        self.notifications_frame.after_idle(self.refresh_notifications)
     
     def create_label_panel(self):
         """Create ultra simple label-based notifications panel"""
@@ -72,60 +111,70 @@ class LabelNotificationsPanel:
         )
         self.refresh_button.grid(row=1, column=0, pady=5)
         
-        # Scrollable frame for notifications
+        # Scrollable list for notifications. Rows are canvas windows placed at
+        # index * row height; the scroll region covers every action, but only
+        # the rows in view exist
         self.canvas = tk.Canvas(self.notifications_frame, bg="white", height=400)
-        self.scrollbar = ttk.Scrollbar(self.notifications_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = ttk.Frame(self.canvas)
-        
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-        
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.scrollbar = ttk.Scrollbar(self.notifications_frame, orient="vertical", command=self._on_scrollbar)
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
         
         self.canvas.grid(row=2, column=0, sticky="nsew", pady=5)
         self.scrollbar.grid(row=2, column=1, sticky="ns")
         
         self.notifications_frame.grid_rowconfigure(2, weight=1)
         
-        print(f"DEBUG: Label-based panel created successfully")
+        logger.debug("Label-based panel created successfully")
     
-    def refresh_notifications(self):
-        """Refresh notifications in background thread"""
-        print(f"DEBUG: Starting label-based notifications refresh...")
+    def refresh_notifications(self, force: bool = False):
+        """Refresh notifications in background thread; force skips the cached actions"""
+        if self._fetch_in_flight:
+            # Fold into one follow-up refresh once the running fetch lands
+            self._queued_force = bool(self._queued_force) or force
+            return
+        self._fetch_in_flight = True
+        logger.debug("Starting label-based notifications refresh...")
         
         def fetch_notifications():
             try:
-                print(f"DEBUG: Fetching notifications for {len(self.stocks)} stocks...")
+                logger.debug("Fetching notifications for %s stocks...", len(self.stocks))
                 
                 if not self.stocks:
-                    print(f"DEBUG: No stocks, showing empty message")
+                    logger.debug("No stocks, showing empty message")
                     self.update_labels([])
                     return
                 
-                # Get portfolio symbols
-                portfolio_symbols = []
+                # Get portfolio symbols; an ordered set, since holding both
+                # RELIANCE and RELIANCE.NS must not send RELIANCE.NS twice
+                symbols = {}
                 for stock in self.stocks:
-                    portfolio_symbols.append(stock.symbol)
+                    symbols[stock.symbol] = None
                     if not stock.symbol.endswith('.NS'):
-                        portfolio_symbols.append(f"{stock.symbol}.NS")
+                        symbols[f"{stock.symbol}.NS"] = None
+                portfolio_symbols = list(symbols)
                 
-                print(f"DEBUG: Portfolio symbols: {portfolio_symbols[:5]}...")
+                logger.debug("Portfolio symbols: %s...", portfolio_symbols[:5])
+                
+                cache_key = frozenset(portfolio_symbols)
+                cached = self._actions_cache.get(cache_key)
+                if not force and cached and time.monotonic() - cached[0] < ACTIONS_CACHE_TTL:
+                    logger.debug("Using %s cached actions", len(cached[1]))
+                    self.update_labels(cached[1])
+                    return
                 
                 # Fetch corporate actions
                 actions = corporate_actions_fetcher.get_portfolio_corporate_actions(
                     portfolio_symbols, days_ahead=60
                 )
+                if actions:
+                    # Empty results may be a fetch failure, so only real hits are kept
+                    self._actions_cache = {cache_key: (time.monotonic(), actions)}
                 
-                print(f"DEBUG: Found {len(actions)} actions for labels update...")
+                logger.debug("Found %s actions for labels update...", len(actions))
                 self.update_labels(actions)
                 
-            except Exception as e:
-                print(f"ERROR in label notifications fetch: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Error in label notifications fetch")
                 self.update_labels([])
         
         # Run in background thread
@@ -133,7 +182,7 @@ class LabelNotificationsPanel:
     
     def update_labels(self, actions: List[CorporateAction]):
         """Update labels with corporate actions - MAIN THREAD ONLY"""
-        print(f"DEBUG: Updating labels with {len(actions)} actions")
+        logger.debug("Updating labels with %s actions", len(actions))
         
         def update_on_main_thread():
             try:
@@ -150,52 +199,136 @@ class LabelNotificationsPanel:
                     header_bg = "lightgreen"
                 
                 self.header_label.config(text=header_text, bg=header_bg)
-                print(f"DEBUG: Header updated: {header_text}")
+                logger.debug("Header updated: %s", header_text)
                 
-                # Clear existing notification labels
-                for label in self.notification_labels:
-                    label.destroy()
-                self.notification_labels.clear()
-                
-                if actions:
-                    # Create labels for each action
-                    for i, action in enumerate(actions):
-                        self.create_action_label(action, i)
+                # New results start from the top
+                self._row_actions = [None] * len(self.notification_rows)
+                self.canvas.yview_moveto(0)
+                self.render_visible_rows()
                         
-                print(f"DEBUG: Created {len(self.notification_labels)} notification labels")
+                logger.debug("%s actions in %s pooled rows", len(actions), len(self.notification_rows))
                 
-            except Exception as e:
-                print(f"ERROR updating labels: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Error updating labels")
+            finally:
+                self._finish_refresh()
         
         # Schedule on main thread
         try:
             self.notifications_frame.after(0, update_on_main_thread)
-            print(f"DEBUG: Scheduled label update on main thread")
+            logger.debug("Scheduled label update on main thread")
         except Exception as e:
-            print(f"ERROR scheduling label update: {e}")
+            logger.error("Error scheduling label update: %s", e)
             # Direct call as fallback
             update_on_main_thread()
     
-    def create_action_label(self, action: CorporateAction, index: int):
-        """Create a single action label"""
+    def _on_scrollbar(self, *args):
+        """Scroll the canvas, then refill the pooled rows for the new view"""
+        self.canvas.yview(*args)
+        self.render_visible_rows()
+    
+    def _on_canvas_configure(self, event):
+        """Stretch the rows to the canvas width and fill any newly exposed space"""
+        for row in self.notification_rows:
+            self.canvas.itemconfigure(row[5], width=max(event.width - 10, 1))
+        self.render_visible_rows()
+    
+    def render_visible_rows(self):
+        """Show the actions inside the canvas viewport in the pooled rows"""
+        total = len(self.actions_data)
+        today = datetime.now().date()
+        if total and self._row_height is None:
+            # Rows are fixed-height single-line labels, so measure one once
+            if not self.notification_rows:
+                self.notification_rows.append(self.create_action_row())
+                self._row_actions.append(None)
+            row = self.notification_rows[0]
+            self.create_action_label(self.actions_data[0], 0, row, today)
+            self._row_actions[0] = 0
+            row[0].update_idletasks()
+            height = row[0].winfo_reqheight()
+            self._row_height = (height if height > 1 else ROW_HEIGHT_FALLBACK) + ROW_GAP
+        row_height = self._row_height or ROW_HEIGHT_FALLBACK + ROW_GAP
+        
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), total * row_height))
+        first = max(int(self.canvas.canvasy(0) // row_height), 0)
+        
+        # One row more than fits, so a partly scrolled view has no gap
+        wanted = min(self.canvas.winfo_height() // row_height + 2, total)
+        while len(self.notification_rows) < wanted:
+            self.notification_rows.append(self.create_action_row())
+            self._row_actions.append(None)
+        
+        for slot, row in enumerate(self.notification_rows):
+            index = first + slot
+            if index < total:
+                if self._row_actions[slot] != index:
+                    self.create_action_label(self.actions_data[index], index, row, today)
+                    self._row_actions[slot] = index
+                self.canvas.coords(row[5], 5, index * row_height + ROW_GAP // 2)
+                self.canvas.itemconfigure(row[5], state="normal")
+            else:
+                self.canvas.itemconfigure(row[5], state="hidden")
+    
+    def create_action_row(self):
+        """Create a hidden action row: (frame, title, date, detail, warning, canvas item)"""
+        action_frame = tk.Frame(
+            self.canvas,
+            relief="solid",
+            borderwidth=2,
+            bg="lightyellow",
+            padx=10,
+            pady=8
+        )
+        action_frame.grid_columnconfigure(0, weight=1)
+        
+        title_label = tk.Label(
+            action_frame,
+            font=("Arial", 12, "bold"),
+            anchor="w"
+        )
+        title_label.grid(row=0, column=0, sticky="ew", pady=2)
+        
+        date_label = tk.Label(
+            action_frame,
+            font=("Arial", 10),
+            bg="lightyellow",
+            anchor="w"
+        )
+        date_label.grid(row=1, column=0, sticky="ew")
+        
+        detail_label = tk.Label(
+            action_frame,
+            font=("Arial", 10, "bold"),
+            bg="lightyellow",
+            fg="darkgreen",
+            anchor="w"
+        )
+        detail_label.grid(row=2, column=0, sticky="ew")
+        
+        warning_label = tk.Label(
+            action_frame,
+            font=("Arial", 9),
+            bg="lightyellow",
+            fg="red",
+            anchor="w"
+        )
+        warning_label.grid(row=3, column=0, sticky="ew", pady=2)
+        
+        item = self.canvas.create_window(
+            5, 0, window=action_frame, anchor="nw",
+            width=max(self.canvas.winfo_width() - 10, 1), state="hidden"
+        )
+        
+        return action_frame, title_label, date_label, detail_label, warning_label, item
+    
+    def create_action_label(self, action: CorporateAction, index: int, row: tuple, today: date = None):
+        """Show the action at list position index in a pooled row"""
         try:
-            # Calculate days until
-            days_until = self.calculate_days_until(action.ex_date)
+            action_frame, title_label, date_label, detail_label, warning_label, item = row
             
-            # Create main action frame
-            action_frame = tk.Frame(
-                self.scrollable_frame,
-                relief="solid",
-                borderwidth=2,
-                bg="lightyellow",
-                padx=10,
-                pady=8
-            )
-            action_frame.grid(row=index, column=0, sticky="ew", padx=5, pady=3)
-            self.scrollable_frame.grid_columnconfigure(0, weight=1)
-            action_frame.grid_columnconfigure(0, weight=1)
+            # Calculate days until
+            days_until = self.calculate_days_until(action.ex_date, today)
             
             # Action title
             title_text = f"{index+1}. {action.symbol} - {action.action_type.upper()}"
@@ -208,95 +341,64 @@ class LabelNotificationsPanel:
             else:
                 title_bg = "lightblue"
                 title_fg = "black"
-            
-            title_label = tk.Label(
-                action_frame,
-                text=title_text,
-                font=("Arial", 12, "bold"),
-                bg=title_bg,
-                fg=title_fg,
-                anchor="w"
-            )
-            title_label.grid(row=0, column=0, sticky="ew", pady=2)
+            title_label.config(text=title_text, bg=title_bg, fg=title_fg)
             
             # Ex-date info
-            date_text = f"Ex-Date: {action.ex_date} ({days_until})"
-            date_label = tk.Label(
-                action_frame,
-                text=date_text,
-                font=("Arial", 10),
-                bg="lightyellow",
-                anchor="w"
-            )
-            date_label.grid(row=1, column=0, sticky="ew")
+            date_label.config(text=f"Ex-Date: {action.ex_date} ({days_until})")
             
             # Action details
-            if action.action_type.lower() == 'dividend' and action.dividend_amount:
-                detail_text = f"Dividend: Rs. {action.dividend_amount} per share"
-            elif action.action_type.lower() == 'split' and action.ratio_from and action.ratio_to:
-                detail_text = f"Split Ratio: {action.ratio_from}:{action.ratio_to}"
-            elif action.action_type.lower() == 'bonus' and action.ratio_from and action.ratio_to:
-                detail_text = f"Bonus Ratio: {action.ratio_from}:{action.ratio_to}"
-            else:
-                detail_text = f"{action.action_type.capitalize()} announced"
-            
-            detail_label = tk.Label(
-                action_frame,
-                text=detail_text,
-                font=("Arial", 10, "bold"),
-                bg="lightyellow",
-                fg="darkgreen",
-                anchor="w"
-            )
-            detail_label.grid(row=2, column=0, sticky="ew")
+            formatter = _DETAIL_FORMATS.get(action.action_type.lower())
+            detail_text = (formatter and formatter(action)) or f"{action.action_type.capitalize()} announced"
+            detail_label.config(text=detail_text)
             
             # Eligibility warning
-            warning_text = f"IMPORTANT: Own shares BEFORE {action.ex_date} to qualify!"
-            warning_label = tk.Label(
-                action_frame,
-                text=warning_text,
-                font=("Arial", 9),
-                bg="lightyellow",
-                fg="red",
-                anchor="w"
-            )
-            warning_label.grid(row=3, column=0, sticky="ew", pady=2)
-            
-            # Store the frame reference
-            self.notification_labels.append(action_frame)
+            warning_label.config(text=f"IMPORTANT: Own shares BEFORE {action.ex_date} to qualify!")
             
-            print(f"DEBUG: Created label for {action.symbol} {action.action_type}")
+            logger.debug("Showing label row for %s %s", action.symbol, action.action_type)
             
         except Exception as e:
-            print(f"ERROR creating action label: {e}")
+            logger.error("Error creating action label: %s", e)
     
-    def calculate_days_until(self, ex_date_str: str) -> str:
-        """Calculate days until ex-date"""
-        try:
-            ex_date = datetime.strptime(ex_date_str, '%Y-%m-%d').date()
-            today = datetime.now().date()
-            days_diff = (ex_date - today).days
-            
-            if days_diff < 0:
-                return f"{abs(days_diff)} days ago"
-            elif days_diff == 0:
-                return "TODAY!"
-            elif days_diff == 1:
-                return "Tomorrow"
-            else:
-                return f"in {days_diff} days"
-        except:
+    def calculate_days_until(self, ex_date_str: str, today: date = None) -> str:
+        """Calculate days until ex-date; callers formatting many actions pass today"""
+        ex_date = _parse_ex_date(ex_date_str)
+        if ex_date is None:
             return "date unknown"
+        days_diff = (ex_date - (today or datetime.now().date())).days
+        
+        if days_diff < 0:
+            return f"{abs(days_diff)} days ago"
+        elif days_diff == 0:
+            return "TODAY!"
+        elif days_diff == 1:
+            return "Tomorrow"
+        else:
+            return f"in {days_diff} days"
     
     def update_stocks(self, stocks: List):
         """Update the stocks list and refresh notifications"""
-        print(f"DEBUG: Label panel updating stocks ({len(stocks)} stocks)")
+        logger.debug("Label panel updating stocks (%s stocks)", len(stocks))
         self.stocks = stocks
+        # Bulk edits call this once per stock; only the last call in a burst fetches
+        if self._stocks_refresh_job:
+            self.notifications_frame.after_cancel(self._stocks_refresh_job)
+        self._stocks_refresh_job = self.notifications_frame.after(250, self._refresh_after_stocks_update)
+    
+    def _refresh_after_stocks_update(self):
+        """Run the debounced refresh scheduled by update_stocks"""
+        self._stocks_refresh_job = None
         self.refresh_notifications()
     
+    def _finish_refresh(self):
+        """Clear the in-flight flag and start any refresh requested meanwhile"""
+        self._fetch_in_flight = False
+        if self._queued_force is not None:
+            force, self._queued_force = self._queued_force, None
+            self.refresh_notifications(force=force)
+    
     def manual_refresh(self):
         """Manual refresh button clicked"""
-        print(f"DEBUG: Manual refresh clicked (label version)")
+        logger.debug("Manual refresh clicked (label version)")
         self.refresh_button.config(state="disabled", text="REFRESHING...")
         
         def enable_button():
@@ -309,7 +411,7 @@ class LabelNotificationsPanel:
         self.notifications_frame.after(3000, enable_button)
         
         # Refresh notifications
-        self.refresh_notifications()
+        self.refresh_notifications(force=True)
     
     def get_notification_count(self) -> int:
         """Get the number of active notifications"""
@@ -39,10 +39,7 @@ class SettingsDialog:
         
         # Center the dialog
         self.dialog.transient(self.parent)
-        self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() // 2) - (500 // 2)
-        y = (self.dialog.winfo_screenheight() // 2) - (400 // 2)
-        self.dialog.geometry(f"500x400+{x}+{y}")
+        ModernUI.center_dialog(self.dialog, 500, 400)
         
         # Create main frame
         main_frame = ttk.Frame(self.dialog, padding="20")
@@ -394,8 +394,9 @@ class StockAdjustmentDialog:
     def load_adjustment_data(self):
         try:
             # Clear tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
             
             # Load adjustments
             adjustments = self.db_manager.get_stock_adjustments()
@@ -16,8 +16,15 @@ class PortfolioCalculator:
                 total_stocks=0
             )
         
-        total_investment = sum(stock.total_investment for stock in stocks)
-        current_value = sum(stock.current_value for stock in stocks if stock.current_price is not None)
+        # One pass collects both totals and the priced holdings
+        total_investment = 0
+        current_value = 0
+        valid_stocks = []
+        for stock in stocks:
+            total_investment += stock.total_investment
+            if stock.current_price is not None:
+                current_value += stock.current_value
+                valid_stocks.append(stock)
         total_profit_loss = current_value - total_investment
         
         total_profit_loss_percentage = 0
@@ -25,7 +32,6 @@ class PortfolioCalculator:
             total_profit_loss_percentage = (total_profit_loss / total_investment) * 100
         
         # Find best and worst performers
-        valid_stocks = [stock for stock in stocks if stock.current_price is not None]
         best_performer = None
         worst_performer = None
         
@@ -156,6 +156,9 @@ class CloudSyncService:
                 data = response.json()
                 return {"success": True, "message": data.get('message', 'Upload successful')}
             else:
+                if response.status_code == 401:
+                    # Token expired or revoked - require a fresh login
+                    self._clear_token()
                 error = response.json().get('detail', 'Upload failed')
                 return {"success": False, "message": error}
 
@@ -184,6 +187,9 @@ class CloudSyncService:
                     "data": data.get('data')
                 }
             else:
+                if response.status_code == 401:
+                    # Token expired or revoked - require a fresh login
+                    self._clear_token()
                 error = response.json().get('detail', 'Download failed')
                 return {"success": False, "message": error}
 
@@ -207,6 +213,9 @@ class CloudSyncService:
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
             else:
+                if response.status_code == 401:
+                    # Token expired or revoked - require a fresh login
+                    self._clear_token()
                 error = response.json().get('detail', 'Status check failed')
                 return {"success": False, "message": error}
 
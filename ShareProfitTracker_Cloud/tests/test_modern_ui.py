@@ -0,0 +1,83 @@
+"""
+Unit tests for dashboard metric calculations
+Run with: python -m pytest tests/test_modern_ui.py
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui.modern_ui import MetricCalculator, MetricCard, ModernUI
+from data.models import Stock
+from services.calculator import PortfolioCalculator
+
+
+class TestMetricCalculator:
+    """Test cases for portfolio metrics"""
+
+    def setup_method(self):
+        self.stocks = [
+            Stock(symbol="TCS.NS", company_name="TCS", quantity=10,
+                  purchase_price=100, purchase_date="2023-06-15", current_price=120),
+            Stock(symbol="INFY.NS", company_name="Infosys", quantity=5,
+                  purchase_price=200, purchase_date="2023-06-15"),
+        ]
+
+    def test_empty_portfolio(self):
+        """Test metrics for an empty portfolio"""
+        metrics = MetricCalculator.calculate_portfolio_metrics([])
+        assert metrics['total_stocks'] == 0
+        assert metrics['total_gain_loss_pct'] == 0.0
+
+    def test_metrics_match_stock_properties(self):
+        """Test totals agree with the per-stock properties"""
+        metrics = MetricCalculator.calculate_portfolio_metrics(self.stocks)
+        assert metrics['total_investment'] == sum(s.total_investment for s in self.stocks)
+        assert metrics['current_value'] == sum(s.current_value for s in self.stocks)
+        assert metrics['total_gain_loss'] == pytest.approx(-800.0)
+        assert metrics['total_gain_loss_pct'] == pytest.approx(-40.0)
+        assert metrics['total_stocks'] == 2
+
+    def test_metrics_from_summary_match(self):
+        """Test metrics built from a portfolio summary equal a direct calculation"""
+        summary = PortfolioCalculator.calculate_portfolio_summary(self.stocks)
+        assert (MetricCalculator.metrics_from_summary(summary) ==
+                MetricCalculator.calculate_portfolio_metrics(self.stocks))
+
+    def test_format_is_stable_across_cached_calls(self):
+        """Test repeated and signed-zero values format consistently"""
+        assert MetricCalculator.format_currency(-1500) == "-₹1,500.00"
+        assert MetricCalculator.format_currency(-1500.0) == "-₹1,500.00"
+        assert MetricCalculator.format_currency(-0.0) == MetricCalculator.format_currency(0.0) == "₹0.00"
+        assert MetricCalculator.format_percentage(-0.0) == "+0.00%"
+
+
+class FakeLabel:
+    """Records the options a label was configured with"""
+
+    def __init__(self):
+        self.options = {}
+
+    def configure(self, **options):
+        self.options.update(options)
+
+
+class TestMetricCard:
+    """Test cases for refreshing metric cards in place"""
+
+    def test_update_changes_label_text(self):
+        """Test that new figures land in the existing labels"""
+        card = MetricCard(None, FakeLabel(), FakeLabel())
+        card.update("₹10.00", "-1.00%", "negative")
+        assert card.value_label.options == {'text': "₹10.00"}
+        assert card.change_label.options == {
+            'text': f"{ModernUI.ICONS['down_arrow']} -1.00%",
+            'foreground': ModernUI.COLORS['danger']
+        }
+
+    def test_update_without_change_label(self):
+        """Test that cards created without a change indicator ignore changes"""
+        card = MetricCard(None, FakeLabel())
+        card.update("5", "+2.00%", "positive")
+        assert card.value_label.options == {'text': "5"}
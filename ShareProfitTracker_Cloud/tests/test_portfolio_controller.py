@@ -0,0 +1,140 @@
+"""
+Unit tests for portfolio controller
+Run with: python -m pytest tests/test_portfolio_controller.py
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.portfolio_controller import PortfolioController
+from data.models import Stock
+
+
+def make_stock(symbol, company_name, current_price=None, stock_id=None):
+    return Stock(
+        symbol=symbol,
+        company_name=company_name,
+        quantity=10,
+        purchase_price=100,
+        purchase_date="2023-06-15",
+        id=stock_id,
+        current_price=current_price
+    )
+
+
+@pytest.fixture
+def controller():
+    controller = PortfolioController(db_manager=None)
+    controller.state.stocks = [
+        make_stock("TCS.NS", "Tata Consultancy Services", 120, 1),
+        make_stock("INFY.NS", "Infosys", 90, 2),
+        make_stock("RELIANCE.NS", None, 100, 3),
+    ]
+    return controller
+
+
+class TestFilteredSortedStocks:
+    """Test cases for search filtering"""
+
+    def test_empty_search_returns_all(self, controller):
+        """Test that an empty search term keeps every stock"""
+        result = controller.get_filtered_sorted_stocks("")
+        assert len(result) == 3
+
+    def test_search_matches_symbol_case_insensitive(self, controller):
+        """Test that symbols match regardless of case"""
+        result = controller.get_filtered_sorted_stocks("infy")
+        assert [s.symbol for s in result] == ["INFY.NS"]
+
+    def test_search_matches_company_name(self, controller):
+        """Test that company names are searched too"""
+        result = controller.get_filtered_sorted_stocks("consultancy")
+        assert [s.symbol for s in result] == ["TCS.NS"]
+
+    def test_search_does_not_span_symbol_and_company(self, controller):
+        """Test that a query cannot match across the symbol/company boundary"""
+        assert controller.get_filtered_sorted_stocks("ns tata") == []
+
+    def test_search_handles_missing_company_name(self, controller):
+        """Test that stocks without a company name are still searchable"""
+        result = controller.get_filtered_sorted_stocks(" reliance ")
+        assert [s.symbol for s in result] == ["RELIANCE.NS"]
+
+    def test_sorting_does_not_reorder_state(self, controller):
+        """Test that sorting works on a copy of the portfolio"""
+        original = [s.symbol for s in controller.state.stocks]
+        controller.get_filtered_sorted_stocks(sort_field="symbol", ascending=False)
+        assert [s.symbol for s in controller.state.stocks] == original
+
+    def test_sort_by_symbol(self, controller):
+        """Test ascending and descending symbol order"""
+        result = controller.get_filtered_sorted_stocks(sort_field="symbol")
+        assert [s.symbol for s in result] == ["INFY.NS", "RELIANCE.NS", "TCS.NS"]
+        result = controller.get_filtered_sorted_stocks(sort_field="symbol", ascending=False)
+        assert [s.symbol for s in result] == ["TCS.NS", "RELIANCE.NS", "INFY.NS"]
+
+    def test_sort_by_profit_loss(self, controller):
+        """Test sorting by a computed property"""
+        result = controller.get_filtered_sorted_stocks(sort_field="profit_loss")
+        assert [s.symbol for s in result] == ["INFY.NS", "RELIANCE.NS", "TCS.NS"]
+
+    def test_sort_order_refreshed_after_price_change(self, controller):
+        """Test that the cached order is dropped when prices change"""
+        controller.get_filtered_sorted_stocks(sort_field="current_value")
+        controller.state.stocks[0].current_price = 50
+        controller._invalidate_sort_cache()
+        result = controller.get_filtered_sorted_stocks(sort_field="current_value")
+        assert result[0].symbol == "TCS.NS"
+
+    def test_unknown_sort_field_keeps_order(self, controller):
+        """Test that an unknown sort field leaves the portfolio order as-is"""
+        result = controller.get_filtered_sorted_stocks(sort_field="unknown")
+        assert [s.symbol for s in result] == ["TCS.NS", "INFY.NS", "RELIANCE.NS"]
+        result = controller.get_filtered_sorted_stocks(sort_field="unknown", ascending=False)
+        assert [s.symbol for s in result] == ["TCS.NS", "INFY.NS", "RELIANCE.NS"]
+
+    def test_descending_sort_keeps_equal_keys_in_order(self, controller):
+        """Test that lots with the same key keep portfolio order when sorted descending"""
+        controller.state.stocks.append(make_stock("TCS.NS", "Tata Consultancy Services", 120, 4))
+        result = controller.get_filtered_sorted_stocks(sort_field="symbol", ascending=False)
+        assert [s.id for s in result] == [1, 4, 3, 2]
+
+
+class FakeDatabase:
+    """Minimal stand-in for the database manager's stock queries"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_all_stocks(self):
+        return [dict(row) for row in self.rows]
+
+
+class TestFindStockBySymbol:
+    """Test cases for symbol lookups"""
+
+    def setup_method(self):
+        rows = [
+            {"id": 1, "symbol": "TCS.NS", "company_name": "Tata Consultancy Services",
+             "quantity": 10, "purchase_price": 100, "purchase_date": "2023-06-15"},
+            {"id": 2, "symbol": "INFY.NS", "company_name": "Infosys",
+             "quantity": 5, "purchase_price": 90, "purchase_date": "2023-06-15"},
+        ]
+        self.controller = PortfolioController(db_manager=FakeDatabase(rows))
+        self.controller.load_portfolio()
+
+    def test_find_is_case_insensitive(self):
+        """Test that lookups ignore symbol case"""
+        assert self.controller.find_stock_by_symbol("infy.ns").id == 2
+
+    def test_find_missing_symbol(self):
+        """Test that unknown symbols return None"""
+        assert self.controller.find_stock_by_symbol("WIPRO.NS") is None
+
+    def test_index_follows_reload(self):
+        """Test that the lookup reflects the latest load"""
+        self.controller.db_manager.rows.pop()
+        self.controller.load_portfolio()
+        assert self.controller.find_stock_by_symbol("INFY.NS") is None
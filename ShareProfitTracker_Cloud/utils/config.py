@@ -19,6 +19,7 @@ class AppConfig:
     WINDOW_HEIGHT = 700
     MIN_WINDOW_WIDTH = 800
     MIN_WINDOW_HEIGHT = 500
+    SEARCH_DEBOUNCE_MS = 150  # delay before re-filtering after a keystroke
     
     # Currency settings
     CURRENCY_SYMBOL = "Rs."